@@ -0,0 +1,267 @@
+import argparse
+import platform
+import random
+import json
+import time
+import gc
+import sys
+
+from functools import partial
+
+from core.data.table import FieldEnum, Table, CompactTable, PyTable, L10NHashTable, L10NTextTable, BinaryTable, StreamRecords
+
+DEFAULT_ROW_COUNTS = [1000, 100000]
+
+# row counts from this run stages as streaming pipelines over regenerated rows instead of tables kept in memory
+STREAM_ROW_COUNT = 1000000
+
+ENUM_KEYS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+TAG_TEXTS = ['PROTOTYPE', 'ALPHA', 'BETA', 'GAMMA']
+
+# (name, field type expression, value generator)
+FIELDS = [
+    ("id",          "int:pk",           lambda idx, rnd: str(idx + 1)),
+    ("user_id",     "int:fk:User.id",   lambda idx, rnd: str(rnd.randrange(1, 1000))),
+    ("name",        "str:key",          lambda idx, rnd: f"NAME_{idx}"),
+    ("$name[ko]",   "str",              lambda idx, rnd: f"이름_{idx}"),
+    ("$name[en]",   "str",              lambda idx, rnd: f"name {idx}"),
+    ("tag",         "str",              lambda idx, rnd: rnd.choice(TAG_TEXTS)),
+    ("code",        "str:pk",           lambda idx, rnd: f"CODE_{idx}"),
+    ("hash32",      "str:hash32",       lambda idx, rnd: f"H{idx}"),
+    ("hash64",      "str:hash64",       lambda idx, rnd: f"H{idx}"),
+    ("crc",         "str:crc32",        lambda idx, rnd: f"C{idx}"),
+    ("adler",       "str:adler32",      lambda idx, rnd: f"A{idx}"),
+    ("text_utf8",   "str:utf8",         lambda idx, rnd: f"텍스트{idx}"),
+    ("text_utf16",  "str:utf16",        lambda idx, rnd: f"텍스트{idx}"),
+    ("text_ascii",  "str:ascii:replace",lambda idx, rnd: f"text{idx}"),
+    ("digest_md5",  "str:md5",          lambda idx, rnd: f"D{idx}"),
+    ("digest_sha1", "str:sha1",         lambda idx, rnd: f"D{idx}"),
+    ("digest_sha256", "str:sha256",     lambda idx, rnd: f"D{idx}"),
+    ("md5",         "md5",              lambda idx, rnd: f"{rnd.getrandbits(128):032x}"),
+    ("sha1",        "sha1",             lambda idx, rnd: f"{rnd.getrandbits(160):040x}"),
+    ("sha256",      "sha256",           lambda idx, rnd: f"{rnd.getrandbits(256):064x}"),
+    ("level",       "int",              lambda idx, rnd: str(rnd.randrange(-1000, 1000))),
+    ("int8",        "int8",             lambda idx, rnd: str(rnd.randrange(-128, 128))),
+    ("int16",       "int16",            lambda idx, rnd: str(rnd.randrange(-32768, 32768))),
+    ("int32",       "int32",            lambda idx, rnd: str(rnd.randrange(-2 ** 31, 2 ** 31))),
+    ("int64",       "int64",            lambda idx, rnd: str(rnd.randrange(-2 ** 63, 2 ** 63))),
+    ("uint",        "uint",             lambda idx, rnd: str(rnd.randrange(0, 2 ** 32))),
+    ("uint8",       "uint8",            lambda idx, rnd: str(rnd.randrange(0, 2 ** 8))),
+    ("uint16",      "uint16",           lambda idx, rnd: str(rnd.randrange(0, 2 ** 16))),
+    ("uint32",      "uint32",           lambda idx, rnd: str(rnd.randrange(0, 2 ** 32))),
+    ("uint64",      "uint64",           lambda idx, rnd: str(rnd.randrange(0, 2 ** 64))),
+    ("adler32",     "adler32",          lambda idx, rnd: str(rnd.randrange(0, 2 ** 32))),
+    ("crc32",       "crc32",            lambda idx, rnd: str(rnd.randrange(0, 2 ** 32))),
+    ("flags_bin",   "int:bin",          lambda idx, rnd: format(rnd.randrange(0, 256), 'b')),
+    ("flags_oct",   "int:oct",          lambda idx, rnd: format(rnd.randrange(0, 4096), 'o')),
+    ("flags_hex",   "int:hex",          lambda idx, rnd: format(rnd.randrange(0, 0xFFFF), 'x')),
+    ("log_level",   "int:enum:logging", lambda idx, rnd: rnd.choice(ENUM_KEYS)),
+    ("score",       "real",             lambda idx, rnd: str(rnd.random() * 100)),
+    ("score32",     "real32",           lambda idx, rnd: str(rnd.random() * 100)),
+    ("score64",     "real64",           lambda idx, rnd: str(rnd.random() * 100)),
+    ("extra",       "json",             lambda idx, rnd: json.dumps({'idx': idx, 'tags': [rnd.randrange(10)]})),
+    ("open_date",   "date",             lambda idx, rnd: f"2022-{rnd.randrange(1, 13):02}-{rnd.randrange(1, 29):02}"),
+    ("open_time",   "datetime",         lambda idx, rnd: f"2022-12-{rnd.randrange(1, 29):02} {rnd.randrange(24):02}:{rnd.randrange(60):02}:00"),
+    ("duration",    "span",             lambda idx, rnd: f"{rnd.randrange(24):02}:{rnd.randrange(60):02}:{rnd.randrange(60):02}"),
+    ("cool_time",   "time",             lambda idx, rnd: f"00:{rnd.randrange(60):02}:{rnd.randrange(60):02}"),
+    ("#comment",    "str",              lambda idx, rnd: "memo"),
+]
+
+def gen_rows(row_count, seed=0):
+    """
+    synthetic sheet rows covering every field data type and attribute, with a comment row like proto sheets
+    """
+    rnd = random.Random(seed)
+    yield [name for name, expr, gen_value in FIELDS]
+    yield [expr for name, expr, gen_value in FIELDS]
+    yield ['#' + name for name, expr, gen_value in FIELDS]
+    for idx in range(row_count):
+        yield [gen_value(idx, rnd) for name, expr, gen_value in FIELDS]
+
+def create_py_table_legacy(org_table):
+    # baseline: nested generators with one FieldType dispatch per cell
+    def gen_field_values(fld_types, fld_vals):
+        for fld_type, fld_val in zip(fld_types, fld_vals):
+            yield fld_type._convert(fld_val, fld_type._main_attr, fld_type._sub_attr)
+
+    def gen_records(fld_types, rowi):
+        for fld_vals in rowi:
+            yield list(gen_field_values(fld_types, fld_vals))
+
+    fld_types, _ = PyTable.compile(org_table.field_types)
+    return PyTable(org_table.field_names, fld_types, list(gen_records(fld_types, org_table.records)))
+
+def save_binary_table(bin_table):
+    import tempfile
+    import os
+    with tempfile.TemporaryDirectory() as dir_path:
+        bin_table.save(os.path.join(dir_path, 'bench.proto.bin'))
+
+def drain(table):
+    for rec in table.records:
+        pass
+
+# (name, source table, create, streaming create or None when the stage keeps every row by design)
+STAGES = [
+    ('CompactTable', 'org', CompactTable.create, partial(CompactTable.create, stream=True)),
+    ('L10NHashTable', 'org', L10NHashTable.create, partial(L10NHashTable.create, stream=True)),
+    ('L10NTextTable', 'org', L10NTextTable.create, None),
+    ('PyTable.legacy', 'compact', create_py_table_legacy, None),
+    ('PyTable', 'compact', PyTable.create, partial(PyTable.create, stream=True)),
+    ('PyTable.vectorize', 'compact', partial(PyTable.create, vectorize=True), None),
+    ('BinaryTable', 'py', BinaryTable.create, partial(BinaryTable.create, stream=True)),
+    ('BinaryTable.save', 'bin', save_binary_table, save_binary_table),
+]
+
+SOURCE_STAGE_NAMES = {'compact': 'CompactTable', 'py': 'PyTable', 'bin': 'BinaryTable'}
+
+def measure(func, arg, repeat, memory):
+    """
+    returns (best seconds, peak traced bytes or None, result)
+    """
+    best_sec = None
+    for _ in range(repeat):
+        gc.collect()
+        beg_time = time.perf_counter()
+        ret = func(arg)
+        elapsed_sec = time.perf_counter() - beg_time
+        best_sec = elapsed_sec if best_sec is None else min(best_sec, elapsed_sec)
+        del ret
+
+    peak_size = None
+    if memory:
+        import tracemalloc
+        gc.collect()
+        tracemalloc.start()
+        ret = func(arg)
+        peak_size = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    else:
+        ret = func(arg)
+    return best_sec, peak_size, ret
+
+class TimedRecords:
+    """
+    records of a source table, seconds spent producing them(upstream stages) are summed in sec
+    """
+    def __init__(self, recs):
+        self._recs = recs
+        self.sec = 0.0
+
+    def __iter__(self):
+        counter = time.perf_counter
+        reci = iter(self._recs)
+        while True:
+            beg_time = counter()
+            try:
+                rec = next(reci)
+            except StopIteration:
+                break
+            finally:
+                self.sec += counter() - beg_time
+            yield rec
+
+def create_stream_tables(row_count, src_names):
+    """
+    source tables of streaming stages up to the last one of src_names, records are generated again on every iteration
+    """
+    rowi = gen_rows(row_count)
+    tables = {'org': Table(next(rowi), next(rowi), StreamRecords(gen_rows, (row_count,)))}
+    for src_name, prev_name, create in (('compact', 'org', CompactTable.create), ('py', 'compact', PyTable.create), ('bin', 'py', BinaryTable.create)):
+        if not src_names.difference(tables):
+            break
+        tables[src_name] = create(tables[prev_name], stream=True)
+    return tables
+
+def measure_stream(func, src, repeat, memory):
+    """
+    returns (best seconds of the stage own work, peak traced bytes or None), time spent in the source records excluded
+    """
+    best_sec = None
+    peak_size = None
+    for run_idx in range(repeat + (1 if memory else 0)):
+        timed_recs = TimedRecords(src.records)
+        timed_src = type(src)(src.field_names, src.field_types, timed_recs)
+        gc.collect()
+        if run_idx == repeat:
+            import tracemalloc
+            tracemalloc.start()
+            func(timed_src)
+            peak_size = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            break
+
+        beg_time = time.perf_counter()
+        func(timed_src)
+        elapsed_sec = time.perf_counter() - beg_time - timed_recs.sec
+        best_sec = elapsed_sec if best_sec is None else min(best_sec, elapsed_sec)
+    return best_sec, peak_size
+
+def run(row_counts, repeat=1, memory=False, stage_names=None, out_file=None):
+    import logging
+    FieldEnum.add("logging", lambda key: getattr(logging, key))
+
+    out_file = out_file or sys.stdout
+    env = {'python': platform.python_version(), 'platform': platform.platform()}
+    for row_count in row_counts:
+        stream = row_count >= STREAM_ROW_COUNT
+        if stream:
+            # only selected stages run, their sources are stream tables generating records on demand
+            stages = [
+                (stage_name, src_name, create, stream_create) for stage_name, src_name, create, stream_create in STAGES
+                    if stream_create and (not stage_names or stage_name in stage_names)]
+            tables = create_stream_tables(row_count, {src_name for _, src_name, _, _ in stages})
+        else:
+            stages = [
+                (stage_name, src_name, create, stream_create) for stage_name, src_name, create, stream_create in STAGES
+                    if not stage_names or stage_name in stage_names or stage_name in SOURCE_STAGE_NAMES.values()]
+            tables = {'org': Table.create(gen_rows(row_count))}
+            last_stage_idxs = {stages[stage_idx][1]: stage_idx for stage_idx in range(len(stages))}
+
+        for stage_idx, (stage_name, src_name, create, stream_create) in enumerate(stages):
+            if stream:
+                func = stream_create if stage_name == 'BinaryTable.save' else lambda src, stream_create=stream_create: drain(stream_create(src))
+                sec, peak_size = measure_stream(func, tables[src_name], repeat, memory)
+            else:
+                sec, peak_size, table = measure(create, tables[src_name], repeat, memory)
+                for dst_name, src_stage_name in SOURCE_STAGE_NAMES.items():
+                    if stage_name == src_stage_name:
+                        tables[dst_name] = table
+                del table
+
+                # tables no later stage reads are released before measuring the next stage
+                for name in [name for name in tables if last_stage_idxs.get(name, -1) <= stage_idx]:
+                    del tables[name]
+
+            if stage_names and stage_name not in stage_names:
+                continue
+
+            result = dict(env,
+                stage=stage_name,
+                rows=row_count,
+                cols=len(FIELDS),
+                stream=stream,
+                sec=round(sec, 6),
+                rows_per_sec=round(row_count / sec) if sec else None,
+                peak_bytes=peak_size)
+            print(json.dumps(result), file=out_file, flush=True)
+
+        del tables
+
+def main():
+    parser = argparse.ArgumentParser(description="core.data table pipeline benchmark, one json line per stage and row count")
+    parser.add_argument('row_counts', type=int, nargs='*', default=DEFAULT_ROW_COUNTS, help="ex) 1000 100000 1000000 10000000")
+    parser.add_argument('--repeat', type=int, default=1, help="best of N runs")
+    parser.add_argument('--memory', action='store_true', help="trace peak memory with tracemalloc (one extra run)")
+    parser.add_argument('--stage', action='append', choices=[stage_name for stage_name, _, _, _ in STAGES])
+    parser.add_argument('--out', type=str, help="append json lines to this file")
+    args = parser.parse_args()
+
+    if args.out:
+        with open(args.out, 'a', encoding='utf-8') as out_file:
+            run(args.row_counts, args.repeat, args.memory, args.stage, out_file)
+    else:
+        run(args.row_counts, args.repeat, args.memory, args.stage)
+
+if __name__ == '__main__':
+    main()
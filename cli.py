@@ -1,16 +1,32 @@
+import sys
+
+if '--profile-startup' in sys.argv: # before any other import
+    from core.startup import StartupProfiler
+    StartupProfiler.install()
+
 import click
 import logging
+import time
 
 @click.group()
 @click.option('--debug', is_flag=True, default=False, help='Show debug log messages.')
+@click.option('--profile-startup', is_flag=True, default=False, help='Report import and init time per module on exit.')
+@click.option('--log-queue', is_flag=True, default=False, help='Write log records in batches on a background thread.')
 @click.pass_context
-def cli(ctx, debug):
+def cli(ctx, debug, profile_startup, log_queue):
     ctx.ensure_object(dict)
 
+    beg_time = time.perf_counter()
     from core import Application
-    app = Application(logging_level=logging.DEBUG if debug else logging.INFO)
+    app = Application(logging_level=logging.DEBUG if debug else logging.INFO, logging_queue=log_queue)
     ctx.obj['APP'] = app
 
+    if profile_startup:
+        from core.startup import StartupProfiler
+        profiler = StartupProfiler.get()
+        profiler.add_phase('Application', time.perf_counter() - beg_time)
+        ctx.call_on_close(profiler.report)
+
 # https://docs.gspread.org/en/latest/oauth2.html#enable-api-access
 # * windows: %APPDATA%\gspread\service_account.json
 # * posix: ~/.config/gspread/service_account.json
@@ -29,5 +45,76 @@ def gspread_csv(name, out):
     out_file_path = book.gen_file_path(out, ext='csv')
     book.export_sheet(out_file_path, sheet_name='csv')
 
+@cli.command()
+@click.argument('names', type=str, nargs=-1, required=True)
+@click.option('--out', type=str, required=True)
+@click.option('--sheet', 'sheet_names', type=str, multiple=True, help='Sheets to export, all sheets by default.')
+@click.option('--format', 'fmt', type=click.Choice(['bin', 'csv']), default='bin')
+@click.option('--jobs', type=int, default=None, help='Number of download threads.')
+@click.option('--force', is_flag=True, default=False, help='Export unchanged books.')
+@click.option('--fake', type=click.Path(exists=True, file_okay=False), help='Read books from local directories instead of google.')
+@click.pass_context
+def gspread_export(ctx, names, out, sheet_names, fmt, jobs, force, fake):
+    from tools.gspread_tool import BatchExporter
+
+    client = None
+    if fake:
+        from tools.gspread_fake import FakeClient
+        client = FakeClient(fake)
+
+    exporter = BatchExporter(out, client=client, fmt=fmt)
+    errors = exporter.export(names, sheet_names=sheet_names, force=force, max_workers=jobs)
+    if errors:
+        ctx.exit(1)
+
+@cli.command()
+@click.argument('proto_dir', type=click.Path(exists=True, file_okay=False))
+@click.pass_context
+def proto_check(ctx, proto_dir):
+    from core.data.project import TableProject
+
+    project = TableProject.load(proto_dir)
+    errors = project.errors + project.validate()
+    for table_name, error in errors:
+        click.echo(f"{table_name}\t{error}", err=True)
+
+    if errors:
+        ctx.exit(1)
+
+@cli.command()
+@click.argument('proto_dir', type=click.Path(exists=True, file_okay=False))
+@click.option('--out', type=str, required=True)
+@click.option('--jobs', type=int, default=None, help='Number of build processes.')
+@click.option('--force', is_flag=True, default=False, help='Rebuild unchanged tables.')
+@click.option('--block-rows', type=int, default=0, help='Write zlib compressed blocks of N rows.')
+@click.pass_context
+def build(ctx, proto_dir, out, jobs, force, block_rows):
+    from tools.build_tool import ProtoBuilder
+
+    builder = ProtoBuilder(proto_dir, out, block_rows)
+    errors = builder.build(force=force, max_workers=jobs)
+    if errors:
+        ctx.exit(1)
+
+@cli.command()
+@click.argument('old_file', type=click.Path(exists=True, dir_okay=False))
+@click.argument('new_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--out', type=str, required=True, help='Patch file path.')
+def table_diff(old_file, new_file, out):
+    from core.data.patch import TablePatch
+
+    patch = TablePatch.diff(old_file, new_file)
+    patch.save(out)
+
+@cli.command()
+@click.argument('patch_file', type=click.Path(exists=True, dir_okay=False))
+@click.argument('table_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--out', type=str, help='Write the patched table here instead of updating TABLE_FILE.')
+def table_patch(patch_file, table_file, out):
+    from core.data.patch import TablePatch
+
+    patch = TablePatch.load(patch_file)
+    patch.apply(table_file, out)
+
 if __name__ == '__main__':
     cli()
@@ -0,0 +1,154 @@
+import threading
+import logging
+import asyncio
+import mmap
+import os
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .foundation import Uri
+
+class AssetLoader:
+    """
+    asset bytes by uri(see Uri.resolve), prefetched concurrently on a thread pool and kept in a size bounded LRU cache,
+    files of mmap_size or larger are mapped read only instead of read
+    """
+    logger = logging.getLogger('asset')
+
+    _inst = None
+
+    @classmethod
+    def get(cls):
+        if not cls._inst:
+            cls._inst = cls()
+        return cls._inst
+
+    def __init__(self, max_cache_size=0x4000000, mmap_size=0x100000, max_workers=8):
+        self.max_cache_size = max_cache_size
+        self.mmap_size = mmap_size
+        self.cache_size = 0
+
+        self._cache = OrderedDict() # uri: bytes or mmap
+        self._pendings = {} # uri: future
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='asset')
+
+    def __contains__(self, uri):
+        return uri in self._cache
+
+    @staticmethod
+    def get_uri(uri):
+        """
+        uri fields of mapped binary tables are utf8 bytes
+        """
+        return uri.decode('utf8') if isinstance(uri, bytes) else uri
+
+    def load(self, uri):
+        """
+        cached or pending prefetch data, otherwise reads the file on the calling thread. b'' for empty uri
+        """
+        uri = self.get_uri(uri)
+        if not uri:
+            return b''
+
+        with self._lock:
+            data = self._cache.get(uri)
+            if data is not None:
+                self._cache.move_to_end(uri)
+                return data
+            future = self._pendings.get(uri)
+
+        if future:
+            return future.result()
+        return self._load(uri)
+
+    def prefetch(self, uris):
+        """
+        starts loading uris not cached yet, returns futures of them
+        """
+        futures = []
+        with self._lock:
+            for uri in map(self.get_uri, uris):
+                if not uri or uri in self._cache:
+                    continue
+                future = self._pendings.get(uri)
+                if not future:
+                    future = self._pendings[uri] = self._executor.submit(self._load, uri)
+                futures.append(future)
+        return futures
+
+    def prefetch_table(self, table):
+        """
+        prefetches every distinct uri of the table uri fields
+        """
+        from .data.table import t_uri
+
+        uris = set()
+        for fld_name, fld_type in zip(table.field_names, table.field_types):
+            if getattr(fld_type, 't_type', None) is t_uri:
+                uris.update(table.get_column(fld_name))
+        return self.prefetch(uris)
+
+    async def load_async(self, uri):
+        """
+        load() awaited on the event loop without blocking it
+        """
+        uri = self.get_uri(uri)
+        if not uri:
+            return b''
+
+        data = self._cache.get(uri)
+        if data is not None:
+            return data
+
+        future = self.prefetch([uri])
+        return await asyncio.wrap_future(future[0]) if future else self.load(uri)
+
+    def evict(self, uri):
+        with self._lock:
+            data = self._cache.pop(uri, None)
+            if data is not None:
+                self.cache_size -= len(data)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._cache.clear()
+            self.cache_size = 0
+
+    def _load(self, uri):
+        file_path = Uri.resolve(uri)
+        try:
+            with open(file_path, 'rb') as in_file:
+                file_size = os.fstat(in_file.fileno()).st_size
+                if file_size >= self.mmap_size:
+                    data = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    data = in_file.read()
+            self._put(uri, data)
+            return data
+        except Exception as exc:
+            self.logger.error('load', uri=uri, file_path=file_path, exc=repr(exc))
+            raise
+        finally:
+            with self._lock:
+                self._pendings.pop(uri, None)
+
+    def _put(self, uri, data):
+        """
+        mmaps are not closed on eviction, readers may still hold them(closed when unreferenced)
+        """
+        if len(data) > self.max_cache_size:
+            return
+
+        with self._lock:
+            old_data = self._cache.pop(uri, None)
+            if old_data is not None:
+                self.cache_size -= len(old_data)
+
+            self._cache[uri] = data
+            self.cache_size += len(data)
+            while self.cache_size > self.max_cache_size:
+                _, old_data = self._cache.popitem(last=False)
+                self.cache_size -= len(old_data)
@@ -18,4 +18,5 @@ if __name__ == '__main__':
     print(User.id)
     user = User(id=1, name="a")
     print(user)
+    assert(User(1, id=2).id == 1) # positional values win like Model.__init__
     print(Profile.user_id.foreign_key)
\ No newline at end of file
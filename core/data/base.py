@@ -1,4 +1,4 @@
-import inspect
+from types import MemberDescriptorType
 
 class Field:
     class Error(Exception):
@@ -91,10 +91,23 @@ class Field:
         return self.__pk
 
 class DeclMeta(type):
-    def __new__(meta, name, bases, attrs):
-        new_cls = type.__new__(meta, name, bases, attrs)
+    def __new__(meta, name, bases, attrs, slots=False):
+        if slots:
+            # fields are kept out of the class namespace to make room for slots of the same names
+            own_fields = {key: value for key, value in attrs.items() if isinstance(value, Field)}
+            attrs = {key: value for key, value in attrs.items() if key not in own_fields}
+            attrs['__slots__'] = tuple(attrs.get('__slots__', ())) + tuple(own_fields)
+            new_cls = type.__new__(SlotDeclMeta if not issubclass(meta, SlotDeclMeta) else meta, name, bases, attrs)
+
+            slot_fields = {}
+            for base in reversed(new_cls.__mro__[1:]):
+                slot_fields.update(base.__dict__.get('_slot_fields', {}))
+            slot_fields.update(own_fields)
+            type.__setattr__(new_cls, '_slot_fields', slot_fields)
+        else:
+            new_cls = type.__new__(meta, name, bases, attrs)
 
-        field_pairs = inspect.getmembers(new_cls, lambda m:isinstance(m, Field))
+        field_pairs = [(name, value) for name, value in ((name, getattr(new_cls, name, None)) for name in dir(new_cls)) if isinstance(value, Field)]
         for field_name, field_type in field_pairs:
             field_type.bind(new_cls, field_name)
 
@@ -107,10 +120,146 @@ class DeclMeta(type):
 
         new_cls._pk_names = [field_type.name for field_type in new_cls._field_types if field_type.is_primary_key]
 
+        if new_cls._field_names:
+            if '__init__' not in attrs and getattr(new_cls.__init__, 'is_field_init', False):
+                new_cls.__init__ = meta.compile_init(new_cls._field_types)
+            new_cls.from_tuple = classmethod(meta.compile_from_tuple(new_cls._field_names))
+
         return new_cls
 
+    def __init__(cls, name, bases, attrs, slots=False):
+        super(DeclMeta, cls).__init__(name, bases, attrs)
+
+    @staticmethod
+    def compile_init(field_types):
+        # def __init__(self, *_args, id=d0, name=d1, **_kwargs):
+        #     if _args: # positional values win over keywords of the same fields like Model.__init__
+        #         id, name, = (_args + (id, name,)[len(_args):])[:2]
+        #     self.id = id
+        #     self.name = name
+        names = {f'd{idx}': field_type.default_value for idx, field_type in enumerate(field_types)}
+        params = ', '.join(f'{field_type.name}=d{idx}' for idx, field_type in enumerate(field_types))
+        targets = ''.join(f'{field_type.name}, ' for field_type in field_types)
+        lines = ''.join(f'    self.{field_type.name} = {field_type.name}\n' for field_type in field_types)
+        exec(f"def __init__(self, *_args, {params}, **_kwargs):\n"
+            f"    if _args:\n"
+            f"        {targets}= (_args + ({targets})[len(_args):])[:{len(field_types)}]\n"
+            f"{lines}", names)
+
+        init = names['__init__']
+        init.is_field_init = True
+        return init
+
+    @staticmethod
+    def compile_from_tuple(field_names):
+        # def from_tuple(cls, values):
+        #     self = new(cls)
+        #     self.id, self.name, = values
+        #     return self
+        names = {'new': object.__new__}
+        targets = ''.join(f'self.{field_name}, ' for field_name in field_names)
+        exec(f"def from_tuple(cls, values):\n    self = new(cls)\n    {targets}= values\n    return self\n", names)
+        return names['from_tuple']
+
+class SlotDeclMeta(DeclMeta):
+    """
+    class attribute access returns fields instead of slot member descriptors
+    """
+    def __getattribute__(cls, name):
+        value = type.__getattribute__(cls, name)
+        if type(value) is MemberDescriptorType:
+            return type.__getattribute__(cls, '_slot_fields').get(name, value)
+        return value
+
+class ModelRow:
+    """
+    read only proxy of a table record, copied into a model instance on the first write
+    """
+    __slots__ = ('_src',)
+
+    _model_cls = None
+    _materialized_cls = None
+
+    def __init__(self, src):
+        self._src = src
+
+    def __repr__(self):
+        return repr(self.materialize()) if type(self) is self._materialized_cls else f"{self.__class__.__name__}({self._src!r})"
+
+    def materialize(self):
+        if type(self) is not self._materialized_cls:
+            model_cls = self._model_cls
+            self._src = model_cls.from_tuple([getattr(self, name) for name in model_cls.get_field_names()])
+            self.__class__ = self._materialized_cls
+        return self._src
+
+    def get_primary_key_values(self):
+        pk_names = self._model_cls.get_primary_key_names()
+        assert(pk_names)
+        if len(pk_names) == 1:
+            return getattr(self, pk_names[0])
+        else:
+            return tuple(getattr(self, name) for name in pk_names)
+
+    @classmethod
+    def compile(cls, model_cls, table_field_names):
+        def record_property(name, default_value):
+            def get(self, idx=table_field_names.index(name) if name in table_field_names else None):
+                return default_value if idx is None else self._src[idx]
+
+            def set(self, value):
+                setattr(self.materialize(), name, value)
+
+            return property(get, set)
+
+        def model_property(name):
+            def get(self):
+                return getattr(self._src, name)
+
+            def set(self, value):
+                setattr(self._src, name, value)
+
+            return property(get, set)
+
+        field_types = model_cls.get_field_types()
+        record_attrs = {field_type.name: record_property(field_type.name, field_type.default_value) for field_type in field_types}
+        model_attrs = {field_type.name: model_property(field_type.name) for field_type in field_types}
+        record_cls = type(f"{model_cls.__name__}Row", (cls,), dict(record_attrs, __slots__=(), _model_cls=model_cls))
+        materialized_cls = type(f"{model_cls.__name__}Row", (cls,), dict(model_attrs, __slots__=(), _model_cls=model_cls))
+        record_cls._materialized_cls = materialized_cls
+        materialized_cls._materialized_cls = materialized_cls
+        return record_cls
+
+class ModelView:
+    def __init__(self, row_cls, recs):
+        self._row_cls = row_cls
+        self._recs = recs
+
+    def __len__(self):
+        return len(self._recs)
+
+    def __getitem__(self, idx):
+        if type(idx) is slice:
+            return ModelView(self._row_cls, self._recs[idx])
+        return self._row_cls(self._recs[idx])
+
+    def __iter__(self):
+        return map(self._row_cls, self._recs)
+
 class Model(metaclass=DeclMeta):
+    """
+    class User(Model, slots=True) keeps field values in __slots__ instead of __dict__
+    """
+    __slots__ = ()
     __repr_limit = 3
+    _row_classes = {}
+
+    @classmethod
+    def from_tuple(cls, values):
+        self = object.__new__(cls)
+        for name, value in zip(cls.get_field_names(), values):
+            setattr(self, name, value)
+        return self
 
     @classmethod
     def get_field_names(cls):
@@ -124,6 +273,18 @@ class Model(metaclass=DeclMeta):
     def get_primary_key_names(cls):
         return cls._pk_names
 
+    @classmethod
+    def view(cls, table):
+        """
+        rows of table as ModelRow proxies, fields are mapped by table.field_names
+        """
+        key = (cls, tuple(table.field_names))
+        row_cls = cls._row_classes.get(key)
+        if row_cls is None:
+            row_cls = ModelRow.compile(cls, list(table.field_names))
+            cls._row_classes[key] = row_cls
+        return ModelView(row_cls, table.records)
+
     def __init__(self, *args, **kwargs):
         total_field_names = self.get_field_names()
         for name, value in zip(total_field_names, args):
@@ -135,6 +296,8 @@ class Model(metaclass=DeclMeta):
         for field_type in extra_field_types:
             setattr(self, field_type.name, kwargs.get(field_type.name, field_type.default_value))
 
+    __init__.is_field_init = True
+
     def __repr__(self):
         info = ' '.join(f'{key}="{value}"' if type(value) is str else f'{key}={value}' for key, value in self.gen_field_pairs(limit=self.__repr_limit))
         return f"{self.__class__.__name__}({info})"
@@ -0,0 +1,223 @@
+import logging
+import struct
+import mmap
+import os
+
+from bisect import bisect_left, bisect_right
+from zlib import adler32
+
+from .table import Table, L10NHashTable, ROW_IDX_HEADS, ROW_IDX_BODYS
+
+class L10NStringPool:
+    """
+    texts of one locale by adler32 hash of the key text(same as L10NHashTable), mapped read only.
+    adler32 of short keys collides often, so entries keep the key text and are sorted by (hash, key)
+
+    file layout(native byte order)
+        header: MAGIC VERSION COUNT LOCALE_SIZE LOCALE(padded to 4 bytes)
+        body: HASH*COUNT(ascending uint32) OFFSET*(COUNT + 1)(uint32 into BLOB) KEY_SIZE*COUNT(uint32) BLOB(utf8 key and text per entry)
+    """
+    logger = logging.getLogger('l10n')
+
+    MAGIC = b'PYRS'
+    VERSION = 1
+    EXT = '.l10n.bin'
+
+    st_header = struct.Struct('=4sIII')
+
+    @classmethod
+    def get_file_path(cls, dir_path, table_name, locale):
+        return os.path.join(dir_path, f"{table_name}.{locale}{cls.EXT}")
+
+    @classmethod
+    def has_locales(cls, fld_names):
+        return any(L10NHashTable.RO_FIELD_NAME.match(fld_name) for fld_name in fld_names)
+
+    @classmethod
+    def gen_locale_texts(cls, org_table):
+        """
+        {locale: {key text: text}} of $key[locale] fields in one pass of the records(stream tables too), comment rows skipped
+        """
+        fld_names = org_table.field_names
+        mos = [L10NHashTable.RO_FIELD_NAME.match(fld_name) for fld_name in fld_names]
+        for col_idx, mo in enumerate(mos):
+            if mo and mo.group(1) not in fld_names:
+                raise Table.Error(f"L10N_KEY_FIELD_NOT_FOUND", row=ROW_IDX_HEADS, col=col_idx, memo=fld_names[col_idx])
+
+        locale_cols = [(mo.group(2), fld_names.index(mo.group(1)), col_idx) for col_idx, mo in enumerate(mos) if mo]
+        locale_texts = {locale: {} for locale, key_idx, col_idx in locale_cols}
+        for row_idx, rec in enumerate(org_table.records, ROW_IDX_BODYS):
+            if not rec or not rec[0].strip() or rec[0].startswith('#'):
+                continue
+
+            for locale, key_idx, col_idx in locale_cols:
+                texts = locale_texts[locale]
+                key_text = rec[key_idx]
+                if texts.setdefault(key_text, rec[col_idx]) != rec[col_idx]:
+                    raise Table.Error(f"L10N_DUPLICATE_KEY", row=row_idx, col=key_idx, memo=f"{key_text!r}")
+
+        return locale_texts
+
+    @classmethod
+    def build(cls, org_table, out_dir_path, table_name):
+        """
+        one pool file per locale, returns file paths
+        """
+        file_paths = []
+        for locale, texts in cls.gen_locale_texts(org_table).items():
+            file_path = cls.get_file_path(out_dir_path, table_name, locale)
+            cls.save(file_path + '.tmp', locale, texts)
+            os.replace(file_path + '.tmp', file_path)
+            file_paths.append(file_path)
+        return file_paths
+
+    @classmethod
+    def save(cls, file_path, locale, texts):
+        entries = sorted((adler32(key_text.encode('utf8')), key_text.encode('utf8'), text.encode('utf8')) for key_text, text in texts.items())
+        offsets = [0]
+        for key_hash, key, text in entries:
+            offsets.append(offsets[-1] + len(key) + len(text))
+
+        locale = locale.encode('utf8')
+        with open(file_path, 'wb') as out_file:
+            out_file.write(cls.st_header.pack(cls.MAGIC, cls.VERSION, len(entries), len(locale)))
+            out_file.write(locale.ljust((len(locale) + 3) & ~3, b'\0'))
+            out_file.write(struct.pack(f'={len(entries)}I', *(key_hash for key_hash, key, text in entries)))
+            out_file.write(struct.pack(f'={len(offsets)}I', *offsets))
+            out_file.write(struct.pack(f'={len(entries)}I', *(len(key) for key_hash, key, text in entries)))
+            out_file.write(b''.join(key + text for key_hash, key, text in entries))
+
+    @classmethod
+    def open(cls, file_path):
+        with open(file_path, 'rb') as in_file:
+            buf = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, locale_size = cls.st_header.unpack_from(buf, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            buf.close()
+            raise Table.Error(f"FILE_FORMAT_ERROR", row=0, col=0, memo=f"{file_path} {magic} v{version}")
+        return cls(buf, count, locale_size)
+
+    def __init__(self, buf, count, locale_size):
+        offset = self.st_header.size
+        self.locale = bytes(buf[offset:offset + locale_size]).decode('utf8')
+        offset += (locale_size + 3) & ~3
+
+        view = memoryview(buf)
+        self._buf = buf
+        self._view = view
+        self._hashes = view[offset:offset + count * 4].cast('I')
+        offset += count * 4
+        self._offsets = view[offset:offset + (count + 1) * 4].cast('I')
+        offset += (count + 1) * 4
+        self._key_sizes = view[offset:offset + count * 4].cast('I')
+        self._blob_offset = offset + count * 4
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def __contains__(self, key_text):
+        return self.find(key_text) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def find(self, key_text):
+        """
+        entry index of the key text, None if not found
+        """
+        key = key_text.encode('utf8')
+        key_hash = adler32(key)
+        hashes = self._hashes
+        lo = bisect_left(hashes, key_hash)
+        end = hi = bisect_right(hashes, key_hash, lo)
+
+        # entries of the same hash are sorted by key bytes
+        view, offsets, key_sizes, blob_offset = self._view, self._offsets, self._key_sizes, self._blob_offset
+        get_key = lambda idx: bytes(view[blob_offset + offsets[idx]:blob_offset + offsets[idx] + key_sizes[idx]])
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if get_key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < end and get_key(lo) == key else None
+
+    def get_entry_text(self, idx):
+        beg = self._blob_offset + self._offsets[idx] + self._key_sizes[idx]
+        end = self._blob_offset + self._offsets[idx + 1]
+        return str(self._view[beg:end], 'utf8')
+
+    def get(self, key_hash, default=None):
+        """
+        text of the only key with the hash, default when no key or colliding keys have it(use get_text for them)
+        """
+        hashes = self._hashes
+        idx = bisect_left(hashes, key_hash)
+        if idx == len(hashes) or hashes[idx] != key_hash:
+            return default
+        if idx + 1 < len(hashes) and hashes[idx + 1] == key_hash:
+            return default
+        return self.get_entry_text(idx)
+
+    def get_text(self, key_text, default=None):
+        idx = self.find(key_text)
+        return default if idx is None else self.get_entry_text(idx)
+
+    def close(self):
+        self._hashes.release()
+        self._offsets.release()
+        self._key_sizes.release()
+        self._view.release()
+        self._buf.close()
+
+class L10N:
+    """
+    string pools of the active locale, opened per table on first lookup.
+    set_locale swaps in an empty pool set at once, pools of the old locale are unmapped when unreferenced
+    """
+    _inst = None
+
+    @classmethod
+    def get(cls):
+        if not cls._inst:
+            cls._inst = cls()
+        return cls._inst
+
+    def __init__(self, dir_path=None, locale=None):
+        self.dir_path = dir_path
+        self._state = (locale, {}) # (locale, {table name: pool or None})
+
+    @property
+    def locale(self):
+        return self._state[0]
+
+    def set_locale(self, locale):
+        if locale != self._state[0]:
+            self._state = (locale, {})
+
+    def get_pool(self, table_name):
+        """
+        None when the table has no texts of the active locale
+        """
+        locale, pools = self._state
+        if table_name in pools:
+            return pools[table_name]
+
+        file_path = L10NStringPool.get_file_path(self.dir_path, table_name, locale)
+        pool = L10NStringPool.open(file_path) if os.path.isfile(file_path) else None
+        if pool is None:
+            L10NStringPool.logger.warning('no pool', table=table_name, locale=locale)
+        return pools.setdefault(table_name, pool)
+
+    def text(self, table_name, key, default=None):
+        """
+        key: key text or its adler32 hash(default for hashes shared by several keys)
+        """
+        pool = self.get_pool(table_name)
+        if pool is None:
+            return default
+        return pool.get(key, default) if type(key) is int else pool.get_text(key, default)
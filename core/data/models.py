@@ -1,12 +1,19 @@
+import os
+
+from zlib import crc32
+
 from .base import Model
 
 class Config(Model):
     class Parser:
+        source_path = None
+
         def deserialize(self):
             return dict()
 
     _inst = None
     _parsers = []
+    _snapshot_dir_path = None
 
     @classmethod
     def get(cls):
@@ -20,12 +27,120 @@ class Config(Model):
         cls._parsers.append(parser)
 
     @classmethod
-    def load(cls):
-        inst = cls.get()
+    def set_snapshot_dir_path(cls, snapshot_dir_path):
+        """
+        converted values are kept per parser source in this directory and reused while the source is unchanged
+        """
+        Config._snapshot_dir_path = snapshot_dir_path
+
+    @classmethod
+    def load(cls, inst=None):
+        if inst is None:
+            inst = cls.get()
+
         for parser in cls._parsers:
-            data = parser.deserialize()
-            assert(type(data) is dict)
-            inst.set(data)
+            snapshot_key = cls.get_snapshot_key(parser)
+            values = cls.load_snapshot(snapshot_key)
+            if values is None:
+                data = parser.deserialize()
+                assert(type(data) is dict)
+                inst.set(data)
+                cls.save_snapshot(snapshot_key, tuple(getattr(inst, name) for name in inst.get_field_names()))
+            else:
+                for name, value in zip(inst.get_field_names(), values):
+                    setattr(inst, name, value)
+
+    @classmethod
+    def build(cls):
+        """
+        new instance loaded from parsers, not swapped in
+        """
+        inst = cls()
+        cls.load(inst)
+        return inst
+
+    @classmethod
+    def reload(cls):
+        """
+        swaps a built instance in, readers holding the old instance keep it unchanged
+        """
+        inst = cls._inst = cls.build()
+        return inst
+
+    @classmethod
+    def get_source_paths(cls):
+        return [parser.source_path for parser in cls._parsers if parser.source_path]
+
+    @classmethod
+    def get_snapshot_key(cls, parser):
+        if not cls._snapshot_dir_path or not parser.source_path:
+            return None
+
+        try:
+            stat = os.stat(parser.source_path)
+        except OSError:
+            return None
+
+        source_path = os.path.realpath(parser.source_path)
+        return (cls.__module__, cls.__qualname__, cls.get_field_declarations(), source_path, stat.st_mtime_ns, stat.st_size)
+
+    @classmethod
+    def get_field_declarations(cls):
+        """
+        field class, convert code and declared attributes(name, default, map...) per field, snapshots miss when any changes
+        """
+        def gen_attr_texts(field_type):
+            for attr_name, value in sorted(vars(field_type).items()):
+                if attr_name in ('_Field__seq', '_Field__model_cls'):
+                    continue
+                text = repr(value)
+                yield f"{attr_name}={type(value).__qualname__ if ' at 0x' in text else text}" # no addresses
+
+        def get_declaration(field_type):
+            field_cls = type(field_type)
+            convert_code = field_cls.convert.__code__
+            return f"{field_cls.__module__}.{field_cls.__qualname__}:{crc32(convert_code.co_code + repr(convert_code.co_consts).encode('utf8')):08x}:{','.join(gen_attr_texts(field_type))}"
+
+        return tuple(map(get_declaration, cls.get_field_types()))
+
+    @classmethod
+    def get_snapshot_file_path(cls, snapshot_key):
+        module_name, class_name, field_declarations, source_path = snapshot_key[:4]
+        file_name = f"{module_name}.{class_name}.{os.path.basename(source_path)}.{crc32(source_path.encode('utf8')):08x}.snapshot"
+        return os.path.join(cls._snapshot_dir_path, file_name)
+
+    @classmethod
+    def load_snapshot(cls, snapshot_key):
+        if not snapshot_key:
+            return None
+
+        import pickle
+        try:
+            with open(cls.get_snapshot_file_path(snapshot_key), 'rb') as snapshot_file:
+                saved_key, values = pickle.load(snapshot_file)
+        except Exception:
+            return None
+
+        return values if saved_key == snapshot_key else None
+
+    @classmethod
+    def save_snapshot(cls, snapshot_key, values):
+        if not snapshot_key:
+            return
+
+        import pickle
+        snapshot_file_path = cls.get_snapshot_file_path(snapshot_key)
+        tmp_file_path = snapshot_file_path + '.tmp'
+        try:
+            os.makedirs(cls._snapshot_dir_path, exist_ok=True)
+            with open(tmp_file_path, 'wb') as snapshot_file:
+                pickle.dump((snapshot_key, values), snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file_path, snapshot_file_path)
+        except Exception: # unpicklable values(TypeError) too, the config just has no snapshot
+            pass
+        finally:
+            if os.path.exists(tmp_file_path):
+                os.remove(tmp_file_path)
 
     def set(self, in_dict):
         total_field_names = self.get_field_names()
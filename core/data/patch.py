@@ -0,0 +1,325 @@
+import logging
+import struct
+import os
+
+from zlib import crc32, compress, decompress
+from itertools import islice
+from bisect import bisect_left
+
+from .table import Table, FieldType, BinaryTable, MappedTable, ROW_IDX_TYPES
+
+class TablePatch:
+    """
+    rows changed between two builds of a BinaryTable file, matched by pk
+        deletes: [pk]
+        inserts: [(row index in new build, record)]
+        updates: [(pk, [(col_idx, value)])], changed columns only
+
+    file layout(native byte order)
+        header: MAGIC VERSION BASE_CRC32 COLUMNS DELETES INSERTS UPDATES (NAME_SIZE NAME TYPE_SIZE TYPE)*
+        body: zlib(PK* (ROW_IDX RECORD)* (PK FIELDS (COL_IDX VALUE)*)*)
+        value: fixed width field type struct, (SIZE BYTES) for variable length bytes
+    """
+    logger = logging.getLogger('patch')
+
+    MAGIC = b'PYRP'
+    VERSION = 1
+
+    st_header = struct.Struct('=4sIIIIII')
+    st_size = struct.Struct('=I')
+    st_col_idx = struct.Struct('=H')
+
+    @classmethod
+    def get_file_crc(cls, file_path):
+        crc = 0
+        with open(file_path, 'rb') as in_file:
+            for data in iter(lambda: in_file.read(0x100000), b''):
+                crc = crc32(data, crc)
+        return crc
+
+    @classmethod
+    def diff(cls, old_file_path, new_file_path):
+        with MappedTable.open(old_file_path) as old_table, MappedTable.open(new_file_path) as new_table:
+            fld_names = old_table.field_names
+            fld_exprs = [str(fld_type) for fld_type in old_table.field_types]
+            if fld_names != new_table.field_names or fld_exprs != [str(fld_type) for fld_type in new_table.field_types]:
+                raise Table.Error(f"PATCH_SCHEMA_ERROR", row=ROW_IDX_TYPES, col=0, memo=f"{old_file_path} {new_file_path}")
+
+            pk_col_idxs = [fld_names.index(fld_name) for fld_name in old_table.get_primary_key_names()]
+            old_index = old_table.get_primary_key_index()
+            new_table.get_primary_key_index() # raises DUPLICATE_KEY
+
+            old_recs = list(old_table.records)
+            new_recs = list(new_table.records)
+
+        get_pk = cls.get_pk_getter(pk_col_idxs)
+
+        # rows on the longest run keeping their relative order are updated, others(moved or new) are deleted and inserted
+        new_pks = [get_pk(new_rec) for new_rec in new_recs]
+        kept_row_idxs = cls.get_kept_row_indexes([old_index.get(pk) for pk in new_pks])
+
+        inserts = []
+        updates = []
+        kept_pks = set()
+        for new_row_idx, (pk, new_rec) in enumerate(zip(new_pks, new_recs)):
+            if new_row_idx not in kept_row_idxs:
+                inserts.append((new_row_idx, new_rec))
+                continue
+
+            old_row_idx = old_index[pk]
+            kept_pks.add(pk)
+            old_rec = old_recs[old_row_idx]
+            if old_rec != new_rec:
+                updates.append((pk, [(col_idx, new_val) for col_idx, (old_val, new_val) in enumerate(zip(old_rec, new_rec)) if old_val != new_val]))
+
+        deletes = [pk for pk in old_index if pk not in kept_pks]
+        cls.logger.info('diff', rows=len(new_recs), deletes=len(deletes), inserts=len(inserts), updates=len(updates))
+        return cls(fld_names, fld_exprs, cls.get_file_crc(old_file_path), deletes, inserts, updates)
+
+    @staticmethod
+    def get_kept_row_indexes(old_row_idxs):
+        """
+        new row indexes on the longest increasing subsequence of old row indexes(None for new rows), O(n log n)
+        """
+        tail_old_row_idxs = [] # smallest tail old row index of increasing runs per length
+        tail_row_idxs = []
+        prev_row_idxs = [None] * len(old_row_idxs)
+        for row_idx, old_row_idx in enumerate(old_row_idxs):
+            if old_row_idx is None:
+                continue
+
+            pos = bisect_left(tail_old_row_idxs, old_row_idx)
+            prev_row_idxs[row_idx] = tail_row_idxs[pos - 1] if pos else None
+            if pos == len(tail_old_row_idxs):
+                tail_old_row_idxs.append(old_row_idx)
+                tail_row_idxs.append(row_idx)
+            else:
+                tail_old_row_idxs[pos] = old_row_idx
+                tail_row_idxs[pos] = row_idx
+
+        kept_row_idxs = set()
+        row_idx = tail_row_idxs[-1] if tail_row_idxs else None
+        while row_idx is not None:
+            kept_row_idxs.add(row_idx)
+            row_idx = prev_row_idxs[row_idx]
+        return kept_row_idxs
+
+    @classmethod
+    def get_pk_getter(cls, pk_col_idxs):
+        if len(pk_col_idxs) == 1:
+            pk_col_idx, = pk_col_idxs
+            return lambda rec: rec[pk_col_idx]
+        return lambda rec: tuple(rec[col_idx] for col_idx in pk_col_idxs)
+
+    @classmethod
+    def get_codecs(cls, fld_exprs):
+        """
+        struct of fixed width fields, None for variable length bytes
+        """
+        codes = [FieldType.parse(fld_expr).struct_code for fld_expr in fld_exprs]
+        return [struct.Struct('=' + code) if code else None for code in codes]
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, 'rb') as in_file:
+            buf = in_file.read()
+
+        magic, version, base_crc, col_count, delete_count, insert_count, update_count = cls.st_header.unpack_from(buf, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise Table.Error(f"FILE_FORMAT_ERROR", row=0, col=0, memo=f"{file_path} {magic} v{version}")
+
+        def read_bytes(buf, offset):
+            size, = cls.st_size.unpack_from(buf, offset)
+            offset += cls.st_size.size
+            return buf[offset:offset + size], offset + size
+
+        fld_names = []
+        fld_exprs = []
+        offset = cls.st_header.size
+        for col_idx in range(col_count):
+            fld_name, offset = read_bytes(buf, offset)
+            fld_expr, offset = read_bytes(buf, offset)
+            fld_names.append(fld_name.decode('utf8'))
+            fld_exprs.append(fld_expr.decode('utf8'))
+
+        codecs = cls.get_codecs(fld_exprs)
+        pk_col_idxs = [col_idx for col_idx, fld_expr in enumerate(fld_exprs) if FieldType.parse(fld_expr).main_attr == 'pk']
+        body = decompress(buf[offset:])
+        offset = 0
+
+        def read_value(col_idx):
+            nonlocal offset
+            codec = codecs[col_idx]
+            if codec:
+                val, = codec.unpack_from(body, offset)
+                offset += codec.size
+                return val
+
+            val, offset = read_bytes(body, offset)
+            return val
+
+        def read_pk():
+            vals = [read_value(col_idx) for col_idx in pk_col_idxs]
+            return vals[0] if len(vals) == 1 else tuple(vals)
+
+        def read_size():
+            nonlocal offset
+            size, = cls.st_size.unpack_from(body, offset)
+            offset += cls.st_size.size
+            return size
+
+        def read_col_idx():
+            nonlocal offset
+            col_idx, = cls.st_col_idx.unpack_from(body, offset)
+            offset += cls.st_col_idx.size
+            return col_idx
+
+        deletes = [read_pk() for _ in range(delete_count)]
+        inserts = [(read_size(), [read_value(col_idx) for col_idx in range(col_count)]) for _ in range(insert_count)]
+        updates = []
+        for _ in range(update_count):
+            pk = read_pk()
+            col_vals = []
+            for _ in range(read_size()):
+                col_idx = read_col_idx()
+                col_vals.append((col_idx, read_value(col_idx)))
+            updates.append((pk, col_vals))
+
+        return cls(fld_names, fld_exprs, base_crc, deletes, inserts, updates)
+
+    def __init__(self, fld_names, fld_exprs, base_crc, deletes, inserts, updates):
+        self.fld_names = fld_names
+        self.fld_exprs = fld_exprs
+        self.base_crc = base_crc
+        self.deletes = deletes
+        self.inserts = inserts
+        self.updates = updates
+
+    def __bool__(self):
+        return bool(self.deletes or self.inserts or self.updates)
+
+    def save(self, file_path):
+        codecs = self.get_codecs(self.fld_exprs)
+        pk_col_idxs = [col_idx for col_idx, fld_expr in enumerate(self.fld_exprs) if FieldType.parse(fld_expr).main_attr == 'pk']
+        body = bytearray()
+
+        def write_value(col_idx, val):
+            codec = codecs[col_idx]
+            if codec:
+                body.extend(codec.pack(val))
+            else:
+                body.extend(self.st_size.pack(len(val)))
+                body.extend(val)
+
+        def write_pk(pk):
+            vals = [pk] if len(pk_col_idxs) == 1 else pk
+            for col_idx, val in zip(pk_col_idxs, vals):
+                write_value(col_idx, val)
+
+        for pk in self.deletes:
+            write_pk(pk)
+        for row_idx, rec in self.inserts:
+            body.extend(self.st_size.pack(row_idx))
+            for col_idx, val in enumerate(rec):
+                write_value(col_idx, val)
+        for pk, col_vals in self.updates:
+            write_pk(pk)
+            body.extend(self.st_size.pack(len(col_vals)))
+            for col_idx, val in col_vals:
+                body.extend(self.st_col_idx.pack(col_idx))
+                write_value(col_idx, val)
+
+        tmp_file_path = file_path + '.tmp'
+        with open(tmp_file_path, 'wb') as out_file:
+            out_file.write(self.st_header.pack(self.MAGIC, self.VERSION, self.base_crc, len(self.fld_names), len(self.deletes), len(self.inserts), len(self.updates)))
+            for fld_name, fld_expr in zip(self.fld_names, self.fld_exprs):
+                fld_name = fld_name.encode('utf8')
+                fld_expr = fld_expr.encode('utf8')
+                out_file.write(self.st_size.pack(len(fld_name)) + fld_name + self.st_size.pack(len(fld_expr)) + fld_expr)
+            out_file.write(compress(body))
+        os.replace(tmp_file_path, file_path)
+
+    def apply(self, file_path, out_file_path=None):
+        """
+        patches file_path in place when only fixed width values changed,
+        otherwise rewrites it(or writes out_file_path) from patched records. returns True when patched in place
+        """
+        if self.get_file_crc(file_path) != self.base_crc:
+            raise Table.Error(f"PATCH_BASE_ERROR", row=0, col=0, memo=f"{file_path} crc32 != {self.base_crc:08x}")
+
+        if out_file_path is None and self.apply_in_place(file_path):
+            self.logger.info('apply', file_path=file_path, in_place=True)
+            return True
+
+        with MappedTable.open(file_path) as table:
+            if table.field_names != self.fld_names or [str(fld_type) for fld_type in table.field_types] != self.fld_exprs:
+                raise Table.Error(f"PATCH_SCHEMA_ERROR", row=ROW_IDX_TYPES, col=0, memo=file_path)
+
+            block_rows = table.records.block_rows
+            get_pk = self.get_pk_getter([self.fld_names.index(fld_name) for fld_name in table.get_primary_key_names()])
+            deletes = set(self.deletes)
+            updates = dict(self.updates)
+
+            recs = []
+            for rec in table.records:
+                pk = get_pk(rec)
+                if pk in deletes:
+                    continue
+                col_vals = updates.get(pk)
+                if col_vals:
+                    for col_idx, val in col_vals:
+                        rec[col_idx] = val
+                recs.append(rec)
+
+        # inserts are ordered by new build row index
+        patched_recs = []
+        reci = iter(recs)
+        for row_idx, rec in self.inserts:
+            patched_recs.extend(islice(reci, row_idx - len(patched_recs)))
+            patched_recs.append(list(rec))
+        patched_recs.extend(reci)
+
+        bin_table = BinaryTable([fld_name.encode('utf8') for fld_name in self.fld_names], [fld_expr.encode('utf8') for fld_expr in self.fld_exprs], patched_recs)
+        out_file_path = out_file_path or file_path
+        tmp_file_path = out_file_path + '.tmp'
+        bin_table.save(tmp_file_path, block_rows=block_rows)
+        os.replace(tmp_file_path, out_file_path)
+        self.logger.info('apply', file_path=out_file_path, in_place=False)
+        return False
+
+    def apply_in_place(self, file_path):
+        """
+        overwrites changed values of an uncompressed file through a writable mmap, False when the patch needs a rewrite.
+        dictionary coded columns always need one, the dictionary of the new build is ordered by first occurrence
+        and the patched file must stay byte identical to it(base crc of the next patch)
+        """
+        import mmap
+
+        if self.deletes or self.inserts:
+            return False
+
+        with MappedTable.open(file_path) as table:
+            recs = table.records
+            if recs.block_rows:
+                return False
+
+            index = table.get_primary_key_index()
+            layout = recs.layout
+            writes = []
+            for pk, col_vals in self.updates:
+                row_idx = index.get(pk)
+                if row_idx is None:
+                    return False
+
+                for col_idx, val in col_vals:
+                    offset, code = layout[col_idx]
+                    if not code or recs.get_dictionary(col_idx) is not None:
+                        return False
+
+                    writes.append((recs.data_offset + row_idx * recs.stride + offset, struct.Struct('=' + code), val))
+
+        with open(file_path, 'r+b') as out_file, mmap.mmap(out_file.fileno(), 0) as buf:
+            for offset, st, val in writes:
+                st.pack_into(buf, offset, val)
+            buf.flush()
+        return True
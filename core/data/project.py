@@ -0,0 +1,144 @@
+import logging
+import os
+
+from array import array
+
+from .table import Table, CompactTable, PyTable, ROW_IDX_BODYS
+
+class TableProject:
+    """
+    every *.proto.csv table of a directory, foreign keys checked against pk indexes
+    """
+    logger = logging.getLogger('proto')
+
+    PROTO_CSV_EXT = '.proto.csv'
+
+    @classmethod
+    def load(cls, proto_dir_path):
+        """
+        tables are loaded one by one, csv parsing and conversion are pure python(threads would only contend for the GIL)
+        """
+        file_names = sorted(file_name for file_name in os.listdir(proto_dir_path) if file_name.endswith(cls.PROTO_CSV_EXT))
+        file_paths = [os.path.join(proto_dir_path, file_name) for file_name in file_names]
+        results = [cls.load_table(file_path) for file_path in file_paths]
+
+        project = cls()
+        for file_name, (table, error) in zip(file_names, results):
+            table_name = file_name[:-len(cls.PROTO_CSV_EXT)]
+            if error:
+                project.errors.append((table_name, error))
+            else:
+                project.add_table(table_name, table)
+        return project
+
+    @classmethod
+    def load_table(cls, file_path):
+        """
+        (table, None) or (None, error), any failure is the error of the file only
+        """
+        cls.logger.debug('load', file_path=file_path)
+        try:
+            return PyTable.create(CompactTable.create(Table.load_csv(file_path))), None
+        except Table.Error as error:
+            return None, error
+        except Exception as exc:
+            return None, Table.Error(f"TABLE_LOAD_ERROR", row=0, col=0, memo=f"{file_path} {exc!r}")
+
+    def __init__(self):
+        self.tables = {}
+        self.errors = []
+        self.foreign_offsets = {}
+        self._indexes = {}
+
+    def add_table(self, table_name, table):
+        self.tables[table_name.lower()] = table
+
+    def replace_table(self, table_name, table):
+        """
+        new project with the table replaced, other tables and their indexes are shared(validate it again to resolve foreign keys)
+        """
+        table_name = table_name.lower()
+        project = self.__class__()
+        project.tables = dict(self.tables)
+        project.tables[table_name] = table
+        project.errors = [(name, error) for name, error in self.errors if name.lower() != table_name]
+        project._indexes = {key: index for key, index in self._indexes.items() if key[0] != table_name}
+        return project
+
+    def get_table(self, table_name):
+        return self.tables.get(table_name.lower())
+
+    def get_index(self, table_name, fld_name):
+        key = (table_name.lower(), fld_name)
+        index = self._indexes.get(key)
+        if index is None:
+            table = self.get_table(table_name)
+            if table.get_primary_key_names() == [fld_name]:
+                index = table.get_primary_key_index()
+            else:
+                index = table.build_index([fld_name])
+            self._indexes[key] = index
+        return index
+
+    def gen_foreign_keys(self):
+        """
+        yields (table name, column index, target table name, target field name)
+        """
+        for table_name, table in self.tables.items():
+            for col_idx, fld_type in enumerate(table.field_types):
+                if fld_type.main_attr != 'fk':
+                    continue
+
+                target_table_name, _, target_fld_name = (fld_type.sub_attr or '').partition('.')
+                yield table_name, col_idx, target_table_name, target_fld_name
+
+    def validate(self, resolve=False):
+        """
+        returns every dangling reference as Table.Error, keeps row offsets of targets per (table name, field name) if resolve
+        """
+        fks = list(self.gen_foreign_keys())
+
+        def check(fk):
+            table_name, col_idx, target_table_name, target_fld_name = fk
+            table = self.tables[table_name]
+            fld_name = table.field_names[col_idx]
+
+            target_table = self.get_table(target_table_name)
+            if target_table is None or target_fld_name not in target_table.field_names:
+                memo = f"{table_name}.{fld_name} -> {target_table_name}.{target_fld_name}"
+                return [Table.Error(f"UNKNOWN_FOREIGN_TABLE", row=ROW_IDX_BODYS, col=col_idx, memo=memo)], None
+
+            try:
+                index = self.get_index(target_table_name, target_fld_name)
+            except Table.Error as error:
+                return [error], None
+
+            vals = table.get_column(fld_name)
+            offsets = array('q', map(index.get, vals, [-1] * len(vals))) if resolve else None
+            errors = [
+                Table.Error(f"DANGLING_FOREIGN_KEY", row=ROW_IDX_BODYS + row_idx, col=col_idx,
+                    memo=f"{table_name}.{fld_name}={val!r} -> {target_table_name}.{target_fld_name}")
+                for row_idx, val in enumerate(vals) if val not in index]
+            return errors, offsets
+
+        results = map(check, fks) # target indexes are built on first use and shared
+
+        errors = []
+        for (table_name, col_idx, _, _), (fk_errors, offsets) in zip(fks, results):
+            errors.extend((table_name, error) for error in fk_errors)
+            if offsets is not None:
+                self.foreign_offsets[(table_name, self.tables[table_name].field_names[col_idx])] = offsets
+        return errors
+
+    def join(self, table_name, fld_name, row_idx):
+        """
+        target record of a resolved foreign key
+        """
+        table_name = table_name.lower()
+        offset = self.foreign_offsets[(table_name, fld_name)][row_idx]
+        if offset < 0:
+            return None
+
+        fld_type = self.tables[table_name].field_types[self.tables[table_name].field_names.index(fld_name)]
+        target_table_name = fld_type.sub_attr.partition('.')[0]
+        return self.get_table(target_table_name).records[offset]
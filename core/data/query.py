@@ -0,0 +1,210 @@
+import operator
+
+from collections import defaultdict
+
+class Query:
+    """
+    where/order_by/group_by then select/aggregate over table columns by field name,
+    predicates run column at a time(pk and field indexes, then dictionary codes, then columns)
+    and only matched rows are read from the table records
+    """
+    OPS = {
+        '==': operator.eq,
+        '!=': operator.ne,
+        '<': operator.lt,
+        '<=': operator.le,
+        '>': operator.gt,
+        '>=': operator.ge,
+        'in': lambda val, vals: val in vals,
+        'not in': lambda val, vals: val not in vals,
+    }
+
+    AGGREGATES = {
+        'count': len,
+        'sum': sum,
+        'min': min,
+        'max': max,
+        'avg': lambda vals: sum(vals) / len(vals),
+        'list': list,
+    }
+
+    INDEX_OPS = ('==', 'in')
+
+    # matched rows fewer than 1/sparse_ratio of the table are read row by row instead of whole columns
+    sparse_ratio = 16
+
+    def __init__(self, table):
+        self._table = table
+        self._preds = []
+        self._orders = []
+        self._group_names = []
+        self._limit = None
+
+    def where(self, fld_name, op, val=None):
+        """
+        op: ==, !=, <, <=, >, >=, in, not in or a function of the column value
+        """
+        self.get_col_idx(fld_name)
+        if not callable(op) and op not in self.OPS:
+            raise ValueError(f"UNKNOWN_QUERY_OP: {op}")
+        self._preds.append((fld_name, op, val))
+        return self
+
+    def order_by(self, fld_name, reverse=False):
+        self.get_col_idx(fld_name)
+        self._orders.append((fld_name, reverse))
+        return self
+
+    def group_by(self, *fld_names):
+        for fld_name in fld_names:
+            self.get_col_idx(fld_name)
+        self._group_names.extend(fld_names)
+        return self
+
+    def limit(self, count):
+        self._limit = count
+        return self
+
+    def get_col_idx(self, fld_name):
+        try:
+            return self._table.field_names.index(fld_name)
+        except ValueError:
+            raise ValueError(f"UNKNOWN_FIELD_NAME: {fld_name}")
+
+    def get_row_indexes(self):
+        row_count = len(self._table.records)
+        row_idxs = None # every row
+        for fld_name, op, val in sorted(self._preds, key=self.get_cost):
+            row_idxs = self.filter(fld_name, op, val, row_idxs, row_count)
+            if not row_idxs:
+                return []
+
+        if row_idxs is None:
+            row_idxs = list(range(row_count))
+
+        # stable sorts from the last key
+        for fld_name, reverse in reversed(self._orders):
+            keys = dict(zip(row_idxs, self.get_columns([fld_name], row_idxs)[0]))
+            row_idxs.sort(key=keys.__getitem__, reverse=reverse)
+
+        return row_idxs if self._limit is None else row_idxs[:self._limit]
+
+    def count(self):
+        return len(self.get_row_indexes())
+
+    def select(self, *fld_names):
+        """
+        returns tuples of fld_names(every field by default) values of matched rows
+        """
+        fld_names = fld_names or self._table.field_names
+        row_idxs = self.get_row_indexes()
+        if not row_idxs:
+            return []
+        return list(zip(*self.get_columns(fld_names, row_idxs)))
+
+    def aggregate(self, **aggs):
+        """
+        returns a dict of group_by fields and aggregates per group(one group without group_by)
+            ex) aggregate(count=('id', 'count'), best=('score', 'max'))
+        """
+        row_idxs = self.get_row_indexes()
+        agg_items = [(agg_name, fld_name, self.AGGREGATES.get(func, func)) for agg_name, (fld_name, func) in aggs.items()]
+        for agg_name, fld_name, func in agg_items:
+            self.get_col_idx(fld_name)
+            if not callable(func):
+                raise ValueError(f"UNKNOWN_QUERY_AGGREGATE: {func}")
+
+        group_names = self._group_names
+        agg_fld_names = [fld_name for agg_name, fld_name, func in agg_items]
+        cols = self.get_columns(group_names + agg_fld_names, row_idxs) if row_idxs else [[] for _ in group_names + agg_fld_names]
+        key_cols = cols[:len(group_names)]
+        agg_cols = cols[len(group_names):]
+
+        groups = defaultdict(list)
+        for pos, key in enumerate(zip(*key_cols) if key_cols else [()] * len(row_idxs)):
+            groups[key].append(pos)
+        if not groups and not group_names:
+            groups[()] = []
+
+        def get_agg_value(func, vals):
+            try:
+                return func(vals)
+            except (ValueError, ZeroDivisionError): # min/max/avg of no rows
+                return None
+
+        results = []
+        for key, poss in groups.items():
+            result = dict(zip(group_names, key))
+            for (agg_name, fld_name, func), col in zip(agg_items, agg_cols):
+                result[agg_name] = get_agg_value(func, [col[pos] for pos in poss])
+            results.append(result)
+        return results
+
+    def get_cost(self, pred):
+        fld_name, op, val = pred
+        table = self._table
+        if op in self.INDEX_OPS:
+            if table.get_primary_key_names() == [fld_name]: return 0
+            if fld_name in table.field_indexes: return 1
+        if self.get_dictionary(fld_name) is not None: return 2
+        return 3
+
+    def get_dictionary(self, fld_name):
+        get_dictionary = getattr(self._table.records, 'get_dictionary', None)
+        return get_dictionary(self.get_col_idx(fld_name)) if get_dictionary else None
+
+    def filter(self, fld_name, op, val, row_idxs, row_count):
+        """
+        returns ascending row indexes of row_idxs(every row for None) matching the predicate
+        """
+        table = self._table
+        if op in self.INDEX_OPS:
+            index = None
+            if table.get_primary_key_names() == [fld_name]:
+                pk_index = table.get_primary_key_index()
+                index = lambda key: () if pk_index.get(key) is None else (pk_index[key],)
+            elif fld_name in table.field_indexes:
+                fld_index = table.field_indexes[fld_name]
+                index = lambda key: fld_index.get(key, ())
+
+            if index:
+                found_idxs = set()
+                for key in ([val] if op == '==' else val):
+                    found_idxs.update(index(key))
+                if row_idxs is not None:
+                    found_idxs.intersection_update(row_idxs)
+                return sorted(found_idxs)
+
+        test = op if callable(op) else (lambda col_val, op_func=self.OPS[op]: op_func(col_val, val))
+
+        # dictionary coded column: test each distinct value once, then compare codes
+        values = self.get_dictionary(fld_name)
+        if values is not None:
+            codes = {code for code in range(len(values)) if test(values[code])}
+            code_col = table.records.get_codes(self.get_col_idx(fld_name))
+            if row_idxs is None:
+                return [row_idx for row_idx, code in enumerate(code_col) if code in codes]
+            return [row_idx for row_idx in row_idxs if code_col[row_idx] in codes]
+
+        if row_idxs is None:
+            return [row_idx for row_idx, col_val in enumerate(table.get_column(fld_name)) if test(col_val)]
+
+        col_vals, = self.get_columns([fld_name], row_idxs)
+        return [row_idx for row_idx, col_val in zip(row_idxs, col_vals) if test(col_val)]
+
+    def get_columns(self, fld_names, row_idxs):
+        """
+        returns values of row_idxs per field, sparse rows are read row by row
+        """
+        table = self._table
+        col_idxs = [self.get_col_idx(fld_name) for fld_name in fld_names]
+        if len(row_idxs) * self.sparse_ratio < len(table.records):
+            recs = table.records
+            rows = [recs[row_idx] for row_idx in row_idxs]
+            return [[row[col_idx] for row in rows] for col_idx in col_idxs]
+
+        cols = []
+        for fld_name in fld_names:
+            col = table.get_column(fld_name)
+            cols.append([col[row_idx] for row_idx in row_idxs])
+        return cols
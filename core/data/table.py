@@ -1,5 +1,7 @@
 import re
-import json
+import time
+import struct
+import logging
 
 from ctypes import c_int8
 from ctypes import c_int16
@@ -11,21 +13,29 @@ from ctypes import c_uint32
 from ctypes import c_uint64
 from ctypes import c_float
 from ctypes import c_double
+from ctypes import sizeof
 
 from enum import Enum
 
 from datetime import date, datetime, timedelta
 
-from hashlib import md5, sha1, sha256
-from zlib import adler32, crc32
+from zlib import adler32, crc32, compress, decompress
+
+from math import isfinite, isinf
 
 from collections import defaultdict, OrderedDict
+from functools import lru_cache
+from itertools import accumulate, islice
+from operator import itemgetter
+from array import array
 
 ROW_IDX_HEADS = 0
 ROW_IDX_TYPES = 1
 ROW_IDX_BODYS = 2
 
-DATETIME_STRPTIME_DEFAULT = datetime.strptime("00:00:00", "%H:%M:%S")
+FLOAT32_MAX = 3.4028234663852886e+38
+
+DATETIME_STRPTIME_DEFAULT = datetime(1900, 1, 1) # datetime.strptime("00:00:00", "%H:%M:%S")
 
 class FieldEnum:
     _ns_get = {}
@@ -33,12 +43,94 @@ class FieldEnum:
     @classmethod
     def add(cls, ns, get):
         cls._ns_get[ns] = get
+        FieldType._expr_to_field_type.clear() # drops memoized enum values
+        PyTable._exprs_to_converter.clear()
 
     @classmethod
     def get(cls, ns, key):
         get = cls._ns_get[ns]
         return get(key)
 
+    @classmethod
+    def getter(cls, ns):
+        return lambda key: cls._ns_get[ns](key)
+
+RO_ISO_DATE = re.compile(r"(\d{4})-(\d\d)-(\d\d)", re.ASCII)
+RO_ISO_DATETIME = re.compile(r"(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d)", re.ASCII)
+RO_ISO_TIME = re.compile(r"(\d\d):(\d\d):(\d\d)", re.ASCII)
+
+def parse_date(val):
+    """
+    datetime.strptime(val, "%Y-%m-%d").date() without strptime for zero padded values
+    """
+    mo = RO_ISO_DATE.fullmatch(val)
+    if mo:
+        try:
+            return date(*map(int, mo.groups()))
+        except ValueError:
+            pass
+    return datetime.strptime(val, "%Y-%m-%d").date()
+
+def parse_datetime(val):
+    mo = RO_ISO_DATETIME.fullmatch(val)
+    if mo:
+        try:
+            return datetime(*map(int, mo.groups()))
+        except ValueError:
+            pass
+    return datetime.strptime(val, "%Y-%m-%d %H:%M:%S")
+
+def parse_time(val):
+    mo = RO_ISO_TIME.fullmatch(val)
+    if mo:
+        hours, minutes, seconds = map(int, mo.groups())
+        if hours < 24 and minutes < 60 and seconds < 60:
+            return timedelta(hours=hours, minutes=minutes, seconds=seconds)
+    return datetime.strptime(val, "%H:%M:%S") - DATETIME_STRPTIME_DEFAULT
+
+def parse_uri(val):
+    """
+    'scheme://path' resolved later through core.foundation.Uri schemes, a plain path or '' for no asset
+    """
+    if '://' in val and not uri_fullmatch(val):
+        raise ValueError(f"INVALID_URI: {val!r}")
+    return val
+
+def lazy_global(name, module_name, attr_path):
+    """
+    stand in of a module level function, imports it on the first call and replaces itself with it in globals
+        attr_path: dotted path in the module(ex: Uri.ro_uri.fullmatch), module_name may be relative to this package
+    """
+    def stand_in(*args, **kwargs):
+        from importlib import import_module
+        func = import_module(module_name, __package__)
+        for attr_name in attr_path.split('.'):
+            func = getattr(func, attr_name)
+        globals()[name] = func
+        return func(*args, **kwargs)
+    return stand_in
+
+json_loads = lazy_global('json_loads', 'json', 'loads')
+json_dumps = lazy_global('json_dumps', 'json', 'dumps')
+hashlib_md5 = lazy_global('hashlib_md5', 'hashlib', 'md5')
+hashlib_sha1 = lazy_global('hashlib_sha1', 'hashlib', 'sha1')
+hashlib_sha256 = lazy_global('hashlib_sha256', 'hashlib', 'sha256')
+uri_fullmatch = lazy_global('uri_fullmatch', '..foundation', 'Uri.ro_uri.fullmatch')
+
+def compile_json_loads(maxsize):
+    """
+    json.loads memoized for scalar values only, arrays and objects are mutable so parsed per cell
+    """
+    from json import loads
+    cached_loads = lru_cache(maxsize=maxsize)(loads)
+
+    def convert(val):
+        if val.lstrip()[:1] in ('[', '{'):
+            return loads(val)
+        return cached_loads(val)
+
+    return convert
+
 class t_str(str): pass
 class t_md5(str): pass
 class t_sha1(str): pass
@@ -52,6 +144,7 @@ class t_real(float): pass
 class t_date(date): pass
 class t_datetime(datetime): pass
 class t_timedelta(timedelta): pass
+class t_uri(str): pass
 
 class FieldType:
     """
@@ -84,6 +177,7 @@ class FieldType:
         'datetime': (t_datetime, bytes),
         'span':     (t_timedelta, bytes),
         'time':     (t_timedelta, bytes),
+        'uri':      (t_uri, bytes),
     }
 
     type_pair_to_convert = {
@@ -97,15 +191,55 @@ class FieldType:
     }
 
     type_to_convert = {
-        t_json: lambda v, m, s: json.loads(v),
+        t_json: lambda v, m, s: json_loads(v),
         t_str: lambda v, m, s: str(v),
         t_real: lambda v, m, s: float(v),
         t_int: lambda v, m, s: int(v, int(m)) if m else int(v),
-        t_date: lambda v, m, s: datetime.strptime(v, "%Y-%m-%d").date(),
-        t_datetime: lambda v, m, s: datetime.strptime(v, "%Y-%m-%d %H:%M:%S"),
-        t_timedelta: lambda v, m, s: datetime.strptime(v, "%H:%M:%S") - DATETIME_STRPTIME_DEFAULT,
+        t_uint: lambda v, m, s: int(v),
+        t_alder32: lambda v, m, s: int(v),
+        t_crc32: lambda v, m, s: int(v),
+        t_md5: lambda v, m, s: str(v),
+        t_sha1: lambda v, m, s: str(v),
+        t_sha256: lambda v, m, s: str(v),
+        t_date: lambda v, m, s: parse_date(v),
+        t_datetime: lambda v, m, s: parse_datetime(v),
+        t_timedelta: lambda v, m, s: parse_time(v),
+        t_uri: lambda v, m, s: parse_uri(v),
+    }
+
+    # (main_attr, sub_attr) -> one argument converter, bound once per field type
+    type_pair_to_compile = {
+        (t_int, 'bin'): lambda m, s: lambda v: int(v, 2),
+        (t_int, 'oct'): lambda m, s: lambda v: int(v, 8),
+        (t_int, 'hex'): lambda m, s: lambda v: int(v, 16),
+        (t_int, 'pk'): lambda m, s: int,
+        (t_int, 'fk'): lambda m, s: int,
+        (t_int, 'enum'): lambda m, s: FieldEnum.getter(s),
+        (t_str, 'key'): lambda m, s: str,
+    }
+
+    type_to_compile = {
+        t_json: lambda m, s: compile_json_loads(FieldType.convert_cache_size),
+        t_str: lambda m, s: str,
+        t_real: lambda m, s: float,
+        t_int: lambda m, s: int,
+        t_uint: lambda m, s: int,
+        t_alder32: lambda m, s: int,
+        t_crc32: lambda m, s: int,
+        t_md5: lambda m, s: str,
+        t_sha1: lambda m, s: str,
+        t_sha256: lambda m, s: str,
+        t_date: lambda m, s: parse_date,
+        t_datetime: lambda m, s: parse_datetime,
+        t_timedelta: lambda m, s: parse_time,
+        t_uri: lambda m, s: parse_uri,
     }
 
+    # converters of low cardinality values memoized per field type(json scalars only), bounded by convert_cache_size
+    memoized_type_pairs = {(t_int, 'enum')}
+    memoized_types = {t_date, t_datetime, t_timedelta}
+    convert_cache_size = 4096
+
     # https://www.sami-lehtinen.net/blog/python-hash-function-performance-comparison
     #  13: python hash
     #  49: zlib.alder32
@@ -126,31 +260,49 @@ class FieldType:
         (t_str, 'utf8'): lambda v, m, s, c: v.encode('utf8', s if s else 'strict'),
         (t_str, 'utf16'): lambda v, m, s, c: v.encode('utf16', s if s else 'strict'),
         (t_str, 'ascii'): lambda v, m, s, c: v.encode('ascii', s if s else 'strict'),
-        (t_str, 'md5'): lambda v, m, s, c: md5(v.encode('utf8')).digest(),
-        (t_str, 'sha1'): lambda v, m, s, c: sha1(v.encode('utf8')).digest(),
-        (t_str, 'sha256'): lambda v, m, s, c: sha256(v.encode('utf8')).digest(),
+        (t_str, 'md5'): lambda v, m, s, c: hashlib_md5(v.encode('utf8')).digest(),
+        (t_str, 'sha1'): lambda v, m, s, c: hashlib_sha1(v.encode('utf8')).digest(),
+        (t_str, 'sha256'): lambda v, m, s, c: hashlib_sha256(v.encode('utf8')).digest(),
     }
 
     type_to_dump = {
+        t_json: lambda v, m, s, c: json_dumps(v, ensure_ascii=False, separators=(',', ':')).encode('utf8'),
         t_str: lambda v, m, s, c: v.encode(m, s if s else 'strict') if m else v.encode('utf8'),
+        t_md5: lambda v, m, s, c: bytes.fromhex(v),
+        t_sha1: lambda v, m, s, c: bytes.fromhex(v),
+        t_sha256: lambda v, m, s, c: bytes.fromhex(v),
         t_date: lambda v, m, s, c: str(v).encode('utf8'),
         t_datetime: lambda v, m, s, c: str(v).encode('utf8'),
         t_timedelta: lambda v, m, s, c: str(v).encode('utf8'),
+        t_uri: lambda v, m, s, c: v.encode('utf8'),
     }
 
+    numeric_t_types = (t_int, t_uint, t_alder32, t_crc32, t_real)
+
+    _expr_to_field_type = {}
+
     @classmethod
     def add(cls, data_type_name, t_type, c_type, convert):
         cls.data_type_name_to_type_pair[data_type_name] = (t_type, c_type)
         cls.type_to_convert[t_type] = convert
+        cls.type_to_compile.pop(t_type, None)
+        cls._expr_to_field_type.clear()
+        PyTable._exprs_to_converter.clear()
 
     @classmethod
     def parse(cls, expr: str):
+        fld_type = cls._expr_to_field_type.get(expr)
+        if fld_type:
+            return fld_type
+
         mo = cls.ro_field_type_expr.match(expr)
         if mo:
             data_type_name = mo.group(1)
             main_attr = mo.group(3)
             sub_attr = mo.group(5)
-            return cls(data_type_name, main_attr, sub_attr, expr)
+            fld_type = cls(data_type_name, main_attr, sub_attr, expr)
+            cls._expr_to_field_type[expr] = fld_type
+            return fld_type
 
     def __init__(self, data_type_name, main_attr, sub_attr, expr):
         t_type, c_type = self.data_type_name_to_type_pair[data_type_name]
@@ -160,9 +312,26 @@ class FieldType:
             dump = self.type_pair_to_dump.get((t_type, main_attr))
             if convert == None and dump == None:
                 raise ValueError(f"UNKNONW_MAIN_ATTR: {main_attr}")
+            compiler = self.type_pair_to_compile.get((t_type, main_attr))
         else:
             convert = self.type_to_convert[t_type]
             dump = self.type_to_dump.get(t_type, lambda v, m, s, c: bytes(c(v)))
+            compiler = self.type_to_compile.get(t_type)
+
+        if convert == None: # dump only attr(ex: str:utf8) converts as data type
+            convert = self.type_to_convert[t_type]
+            compiler = self.type_to_compile.get(t_type)
+
+        if dump == None: # convert only attr(ex: int:hex) dumps as data type
+            dump = self.type_to_dump.get(t_type, lambda v, m, s, c: bytes(c(v)))
+
+        if compiler:
+            compiled_convert = compiler(main_attr, sub_attr)
+        else:
+            compiled_convert = lambda val: convert(val, main_attr, sub_attr) # custom converters take positional args of any names
+
+        if compiler and ((t_type, main_attr) in self.memoized_type_pairs or t_type in self.memoized_types):
+            compiled_convert = lru_cache(maxsize=self.convert_cache_size)(compiled_convert)
 
         self._c_type = c_type
         self._t_type = t_type
@@ -170,6 +339,7 @@ class FieldType:
         self._main_attr = main_attr
         self._data_type_name = data_type_name
         self._convert = convert
+        self._compiled_convert = compiled_convert
         self._dump = dump
         self._expr = expr
 
@@ -177,11 +347,131 @@ class FieldType:
         return self._expr
 
     def convert(self, val):
-        return self._convert(val, self._main_attr, self._sub_attr)
+        return self._compiled_convert(val)
+
+    @property
+    def compiled_convert(self):
+        return self._compiled_convert
+
+    @property
+    def c_type(self):
+        return self._c_type
+
+    @property
+    def t_type(self):
+        return self._t_type
+
+    @property
+    def main_attr(self):
+        return self._main_attr
+
+    @property
+    def sub_attr(self):
+        return self._sub_attr
+
+    @property
+    def struct_code(self):
+        """
+        struct format code of fixed width dumps, None for variable length bytes
+        """
+        if not hasattr(self._c_type, '_type_'): return None
+        if self._c_type in (c_float, c_double): return self._c_type._type_
+        code = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}[sizeof(self._c_type)]
+        return code if self._c_type(-1).value < 0 else code.upper()
+
+    @property
+    def array_code(self):
+        """
+        array.array type code for numeric values, None for python objects
+        """
+        if self._t_type not in self.numeric_t_types: return None
+        if self._main_attr == 'enum': return None
+        return getattr(self._c_type, '_type_', None)
 
     def dump(self, val):
         return self._dump(val, self._main_attr, self._sub_attr, self._c_type)
 
+class TableProfiler:
+    """
+    opt-in timings of table stages(rows/sec) and per column convert/dump,
+    reported as 'table' logger context and kept in stages/columns
+    """
+    logger = logging.getLogger('table')
+
+    _inst = None
+
+    @classmethod
+    def enable(cls):
+        if not cls._inst:
+            cls._inst = cls()
+        return cls._inst
+
+    @classmethod
+    def disable(cls):
+        inst = cls._inst
+        cls._inst = None
+        return inst
+
+    @classmethod
+    def get(cls):
+        return cls._inst
+
+    def __init__(self):
+        self.stages = []
+        self.columns = []
+
+    def wrap(self, stage_name, gen_rows):
+        """
+        gen_rows timing only the time spent producing rows, upstream streams included
+        """
+        def gen_profiled_rows(*args):
+            counter = time.perf_counter
+            rowi = gen_rows(*args)
+            row_count = -ROW_IDX_BODYS # heads, types
+            total_sec = 0.0
+            while True:
+                beg_time = counter()
+                try:
+                    row = next(rowi)
+                except StopIteration:
+                    break
+                finally:
+                    total_sec += counter() - beg_time
+
+                row_count += 1
+                yield row
+
+            self.report_stage(stage_name, max(row_count, 0), total_sec)
+
+        return gen_profiled_rows
+
+    def gen_column_values(self, stage_name, fld_names, funcs, recs, fallback):
+        counter = time.perf_counter
+        col_secs = [0.0] * len(funcs)
+        for row_idx, rec in enumerate(recs, ROW_IDX_BODYS):
+            try:
+                vals = []
+                for col_idx, (func, val) in enumerate(zip(funcs, rec)):
+                    beg_time = counter()
+                    vals.append(func(val))
+                    col_secs[col_idx] += counter() - beg_time
+            except Exception:
+                vals = fallback(row_idx, rec)
+            yield vals
+
+        self.report_columns(stage_name, fld_names, col_secs)
+
+    def report_stage(self, stage_name, row_count, total_sec):
+        stage = dict(stage=stage_name, rows=row_count, sec=round(total_sec, 6),
+            rows_per_sec=round(row_count / total_sec) if total_sec else None)
+        self.stages.append(stage)
+        self.logger.info('stage', **stage)
+
+    def report_columns(self, stage_name, fld_names, col_secs):
+        columns = dict(stage=stage_name, secs={str(fld_name): round(sec, 6) for fld_name, sec in zip(fld_names, col_secs)})
+        self.columns.append(columns)
+        self.logger.info('columns', **columns)
+
 class Table:
     class Error(Exception):
         def __init__(self, name, row, col, memo):
@@ -195,17 +485,59 @@ class Table:
             return f"{self.name}<ROW={self.row} COL={self.col} {self.memo}>"
 
     @classmethod
-    def create(cls, rows: list):
+    def read_header(cls, rowi):
+        """
+        (field names, field types) rows, raises HEADER_NOT_FOUND when either is missing
+        """
+        fld_names = next(rowi, None)
+        if fld_names is None:
+            raise cls.Error(f"HEADER_NOT_FOUND", row=ROW_IDX_HEADS, col=0, memo='no field names')
+        fld_types = next(rowi, None)
+        if fld_types is None:
+            raise cls.Error(f"HEADER_NOT_FOUND", row=ROW_IDX_TYPES, col=0, memo='no field types')
+        return fld_names, fld_types
+
+    @classmethod
+    def create(cls, rows: list, stream=False):
         rowi = iter(rows)
-        fld_names = next(rowi)
-        fld_types = next(rowi)
-        recs = list(rowi)
+        fld_names, fld_types = cls.read_header(rowi)
+        if not stream:
+            recs = list(rowi)
+        elif rowi is rows:
+            recs = IterRecords(rowi)
+        else:
+            recs = SliceRecords(rows, 2)
         return cls(fld_names, fld_types, recs)
 
+    @classmethod
+    def load_csv(cls, file_path, stream=False):
+        import csv
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as csv_file:
+            rowi = csv.reader(csv_file)
+            if stream:
+                fld_names, fld_types = cls.read_header(rowi)
+                return cls(fld_names, fld_types, CsvRecords(file_path))
+            else:
+                return cls.create(rowi)
+
+    @classmethod
+    def create_rows(cls, gen_rows, args, stream):
+        profiler = TableProfiler.get()
+        if profiler:
+            gen_rows = profiler.wrap(cls.__name__, gen_rows)
+
+        rowi = gen_rows(*args)
+        heads = next(rowi)
+        types = next(rowi)
+        recs = StreamRecords(gen_rows, args) if stream else list(rowi)
+        return cls(heads, types, recs)
+
     def __init__(self, fld_names, fld_types, recs):
         self._fld_names = fld_names
         self._fld_types = fld_types
         self._recs = recs
+        self._pk_index = None
+        self._field_indexes = {}
 
     def __repr__(self):
         head_line = ', '.join(repr(fld_name) for fld_name in self._fld_names)
@@ -231,40 +563,308 @@ class Table:
         for rec in self._recs:
             yield rec
 
+    def get_column(self, fld_name):
+        col_idx = self._fld_names.index(fld_name)
+        return [rec[col_idx] for rec in self._recs]
+
+    def get_primary_key_names(self):
+        def gen_names():
+            for fld_name, fld_type in zip(self._fld_names, self._fld_types):
+                expr = fld_type.decode('utf8') if type(fld_type) is bytes else str(fld_type)
+                mo = FieldType.ro_field_type_expr.match(expr)
+                if mo and mo.group(3) == 'pk':
+                    yield fld_name
+
+        return list(gen_names())
+
+    def get_primary_key_index(self):
+        """
+        pk(tuple for composite keys) -> row index, built on first use
+        """
+        if self._pk_index is None:
+            self._pk_index = self.build_index(self.get_primary_key_names())
+        return self._pk_index
+
+    def build_index(self, fld_names):
+        if not fld_names:
+            raise self.Error(f"NO_PRIMARY_KEY", row=ROW_IDX_TYPES, col=0, memo=', '.join(self._fld_names))
+
+        cols = [self.get_column(fld_name) for fld_name in fld_names]
+        keys = cols[0] if len(cols) == 1 else list(zip(*cols))
+        index = dict(zip(keys, range(len(keys))))
+        if len(index) != len(keys):
+            first_idxs = {}
+            for row_idx, key in enumerate(keys):
+                first_idx = first_idxs.setdefault(key, row_idx)
+                if first_idx != row_idx:
+                    raise self.Error(f"DUPLICATE_KEY", row=ROW_IDX_BODYS + row_idx, col=self._fld_names.index(fld_names[0]),
+                        memo=f"{key!r} at ROW={ROW_IDX_BODYS + first_idx}")
+        return index
+
+    @property
+    def field_indexes(self): return self._field_indexes
+
+    def get_field_index(self, fld_name):
+        """
+        {value: [row index]} of a non unique column, built once
+        """
+        index = self._field_indexes.get(fld_name)
+        if index is None:
+            row_idxs = defaultdict(list)
+            for row_idx, val in enumerate(self.get_column(fld_name)):
+                row_idxs[val].append(row_idx)
+            index = self._field_indexes[fld_name] = dict(row_idxs)
+        return index
+
+    def get_row_index(self, pk):
+        return self.get_primary_key_index().get(pk)
+
+    def get(self, pk, default=None):
+        row_idx = self.get_primary_key_index().get(pk)
+        return default if row_idx is None else self._recs[row_idx]
+
+    def get_many(self, pks, default=None):
+        index = self.get_primary_key_index()
+        recs = self._recs
+        return [default if row_idx is None else recs[row_idx] for row_idx in map(index.get, pks)]
+
 class PyTable(Table):
+    _exprs_to_converter = {}
+
+    @classmethod
+    def create(cls, org_table, stream=False, vectorize=False):
+        gen_rows = cls.gen_vectorized_rows if vectorize and not stream else cls.gen_rows
+        return cls.create_rows(gen_rows, (org_table.field_names, org_table.field_types, org_table.records), stream)
+
+    @classmethod
+    def gen_vectorized_rows(cls, fld_names, fld_exprs, recs):
+        """
+        converts column by column, int*/uint*/real* columns at once with numpy when it's installed
+        """
+        fld_types, _ = cls.compile(fld_exprs)
+        yield fld_names
+        yield fld_types
+
+        if not isinstance(recs, (list, tuple)):
+            recs = list(recs)
+
+        cols = [cls.convert_column(fld_type, col_idx, recs, vectorize=True) for col_idx, fld_type in enumerate(fld_types)]
+        yield from map(list, zip(*cols))
+
     @classmethod
-    def create(cls, org_table):
+    def convert_column(cls, fld_type, col_idx, recs, vectorize=False):
+        if vectorize:
+            from . import vectorize as vectorize_module
+            if vectorize_module.get_dtype(fld_type):
+                return vectorize_module.convert_column(fld_type, col_idx, list(map(itemgetter(col_idx), recs))).tolist()
+
+        try:
+            return list(map(fld_type.compiled_convert, map(itemgetter(col_idx), recs)))
+        except Exception:
+            pass
+
+        def gen_column_values():
+            for row_idx, rec in enumerate(recs, ROW_IDX_BODYS):
+                try:
+                    yield fld_type.convert(rec[col_idx])
+                except Exception as exc:
+                    raise cls.Error(f"FIELD_VALUE_CONVERT_ERROR", row=row_idx, col=col_idx, memo=f"{fld_type}({rec[col_idx]!r}) {exc!r}")
+
+        return list(gen_column_values())
+
+    @classmethod
+    def gen_rows(cls, fld_names, fld_exprs, recs):
+        fld_types, convert_record = cls.compile(fld_exprs)
+        yield fld_names
+        yield fld_types
+
+        profiler = TableProfiler.get()
+        if profiler:
+            funcs = [fld_type.compiled_convert for fld_type in fld_types]
+            fallback = lambda row_idx, rec: cls.convert_record(fld_types, row_idx, rec)
+            yield from profiler.gen_column_values(cls.__name__, fld_names, funcs, recs, fallback)
+            return
+
+        for row_idx, rec in enumerate(recs, ROW_IDX_BODYS):
+            try:
+                yield convert_record(rec)
+            except Exception:
+                yield cls.convert_record(fld_types, row_idx, rec)
+
+    @classmethod
+    def compile(cls, fld_exprs):
+        """
+        returns (field types, record converter) memoized by field type expressions
+        """
+        key = tuple(fld_exprs)
+        converter = cls._exprs_to_converter.get(key)
+        if converter:
+            return converter
+
         def gen_field_types(row_idx, exprs: list):
             for col_idx, expr in enumerate(exprs):
                 try:
-                    yield FieldType.parse(expr)
-                except ValueError as exc:
+                    fld_type = FieldType.parse(expr)
+                except (KeyError, ValueError) as exc:
                     raise cls.Error(f"FIELD_TYPE_EXPR_ERROR", row=row_idx, col=col_idx, memo=str(exc))
+                if fld_type is None:
+                    raise cls.Error(f"FIELD_TYPE_EXPR_ERROR", row=row_idx, col=col_idx, memo=repr(expr))
+                yield fld_type
+
+        fld_types = list(gen_field_types(ROW_IDX_TYPES, fld_exprs))
+
+        # def convert_record(rec):
+        #     v0, v1 = rec
+        #     return [c0(v0), c1(v1)]
+        names = {f'c{idx}': fld_type.compiled_convert for idx, fld_type in enumerate(fld_types)}
+        vals = ', '.join(f'v{idx}' for idx in range(len(fld_types)))
+        cnvs = ', '.join(f'c{idx}(v{idx})' for idx in range(len(fld_types)))
+        code = f"def convert_record(rec):\n    {vals}, = rec\n    return [{cnvs}]\n" if fld_types else "def convert_record(rec):\n    return []\n"
+        exec(code, names)
+
+        converter = (fld_types, names['convert_record'])
+        cls._exprs_to_converter[key] = converter
+        return converter
 
-        def gen_field_values(fld_types, fld_vals):
+    @classmethod
+    def convert_record(cls, fld_types, row_idx, fld_vals):
+        def gen_field_values():
             for col_idx, (fld_type, fld_val) in enumerate(zip(fld_types, fld_vals)):
-                yield fld_type.convert(fld_val)
+                try:
+                    yield fld_type.convert(fld_val)
+                except Exception as exc:
+                    raise cls.Error(f"FIELD_VALUE_CONVERT_ERROR", row=row_idx, col=col_idx, memo=f"{fld_type}({fld_val!r}) {exc!r}")
+
+        return list(gen_field_values())
+
+class StreamRecords:
+    """
+    re-iterable records generated on demand by gen_rows(*args)
+    """
+    def __init__(self, gen_rows, args):
+        self._gen_rows = gen_rows
+        self._args = args
+
+    def __iter__(self):
+        rowi = self._gen_rows(*self._args)
+        next(rowi) # heads
+        next(rowi) # types
+        return rowi
+
+class SliceRecords:
+    """
+    re-iterable records of a row sequence(or any re-iterable rows) from start
+    """
+    def __init__(self, rows, start):
+        self._rows = rows
+        self._start = start
+
+    def __iter__(self):
+        return islice(self._rows, self._start, None)
+
+class IterRecords:
+    """
+    records of a row iterator, read once. a second pass raises instead of yielding nothing
+    """
+    def __init__(self, rowi):
+        self._rowi = rowi
+
+    def __iter__(self):
+        rowi, self._rowi = self._rowi, None
+        if rowi is None:
+            raise Table.Error(f"STREAM_RECORDS_CONSUMED", row=ROW_IDX_BODYS, col=0, memo='records of a row iterator are read once')
+        return rowi
+
+class CsvRecords:
+    def __init__(self, file_path):
+        self._file_path = file_path
+
+    def __iter__(self):
+        import csv
+        with open(self._file_path, 'r', encoding='utf-8-sig', newline='') as csv_file:
+            rowi = csv.reader(csv_file)
+            next(rowi, None) # heads
+            next(rowi, None) # types
+            yield from rowi
+
+class ColumnarRecords:
+    def __init__(self, cols):
+        self._cols = cols
 
-        def gen_records(fld_types, rowi):
-            for row_idx, fld_vals in enumerate(rowi):
-                yield list(gen_field_values(fld_types, fld_vals))
+    def __len__(self):
+        return len(self._cols[0]) if self._cols else 0
 
+    def __getitem__(self, idx):
+        return [col[idx] for col in self._cols]
+
+    def __iter__(self):
+        return map(list, zip(*self._cols))
+
+class ColumnarPyTable(PyTable):
+    """
+    stores numeric columns as array.array typed by c_type, others as list
+    """
+    @classmethod
+    def create(cls, org_table, vectorize=False):
         fld_names = org_table.field_names
-        fld_exprs = org_table.field_types
-        fld_types = list(gen_field_types(ROW_IDX_TYPES, fld_exprs))
-        recs = list(gen_records(fld_types, org_table.records))
-        return cls(fld_names, fld_types, recs)
+        fld_types, _ = cls.compile(org_table.field_types)
+
+        recs = org_table.records
+        if not isinstance(recs, (list, tuple)):
+            recs = list(recs)
+
+        cols = [cls.convert_column(fld_type, col_idx, recs, vectorize) for col_idx, fld_type in enumerate(fld_types)]
+        return cls(fld_names, fld_types, cols)
+
+    @classmethod
+    def convert_column(cls, fld_type, col_idx, recs, vectorize=False):
+        if vectorize:
+            from . import vectorize as vectorize_module
+            if vectorize_module.get_dtype(fld_type):
+                col = vectorize_module.convert_column(fld_type, col_idx, list(map(itemgetter(col_idx), recs)))
+                return vectorize_module.to_array(fld_type, col)
+
+        code = fld_type.array_code
+        try:
+            vals = map(fld_type.compiled_convert, map(itemgetter(col_idx), recs))
+            col = array(code, vals) if code else list(vals)
+            if code != 'f' or not any(map(isinf, col)): # float32 overflows to inf silently, checked per value below
+                return col
+        except Exception:
+            pass
+
+        col = array(code) if code else []
+        append = col.append
+        for row_idx, rec in enumerate(recs, ROW_IDX_BODYS):
+            try:
+                val = fld_type.convert(rec[col_idx])
+            except Exception as exc:
+                raise cls.Error(f"FIELD_VALUE_CONVERT_ERROR", row=row_idx, col=col_idx, memo=f"{fld_type} {exc!r}")
+            if code == 'f' and isfinite(val) and abs(val) > FLOAT32_MAX:
+                raise cls.Error(f"FIELD_VALUE_OVERFLOW", row=row_idx, col=col_idx, memo=f"{fld_type}({val!r}) not in [{-FLOAT32_MAX}, {FLOAT32_MAX}]")
+            try:
+                append(val)
+            except (OverflowError, TypeError) as exc:
+                raise cls.Error(f"FIELD_VALUE_OVERFLOW", row=row_idx, col=col_idx, memo=f"{fld_type}({val!r}) {exc}")
+        return col
+
+    def __init__(self, fld_names, fld_types, cols):
+        super(ColumnarPyTable, self).__init__(fld_names, fld_types, ColumnarRecords(cols))
+        self._cols = cols
+
+    @property
+    def columns(self): return self._cols
+
+    def get_column(self, fld_name):
+        return self._cols[self._fld_names.index(fld_name)]
 
 
 class L10NHashTable(Table):
     RO_FIELD_NAME = re.compile('\$(\w+)\[(\w+)\]')
 
     @classmethod
-    def create(cls, org_table):
-        rowi = cls.gen_rows(org_table.field_names, org_table.records)
-        heads = next(rowi)
-        types = next(rowi)
-        return cls(heads, types, list(rowi))
+    def create(cls, org_table, stream=False):
+        return cls.create_rows(cls.gen_rows, (org_table.field_names, org_table.records), stream)
 
     @classmethod
     def gen_rows(cls, field_names, records):
@@ -292,26 +892,28 @@ class L10NHashTable(Table):
 
 class L10NTextTable(Table):
     @classmethod
-    def create(cls, org_table):
-        rowi = cls.gen_rows(org_table.field_names, org_table.records)
-        heads = next(rowi)
-        types = next(rowi)
-        return cls(heads, types, list(rowi))
+    def create(cls, org_table, stream=False):
+        return cls.create_rows(cls.gen_rows, (org_table.field_names, org_table.records), stream)
 
     @classmethod
     def gen_rows(cls, field_names, records):
-        rows = list(L10NHashTable.gen_rows(field_names, records))
-
-        texts = defaultdict(OrderedDict)
-        for head, hash, text in rows[ROW_IDX_BODYS:]:
-            texts[head][hash] = text
-
-        head_texts = list(text for text in texts[0].values())
+        mos = [L10NHashTable.RO_FIELD_NAME.match(field_name) for field_name in field_names]
+        locale_texts = OrderedDict.fromkeys(mo.group(2) for mo in mos if mo)
+        head_texts = ['adler32', 'key'] + list(locale_texts)
         yield head_texts
 
         type_texts = ['int', 'str', 'str']
         yield type_texts
 
+        # grouping texts by key hash needs every text of the sheet
+        rowi = L10NHashTable.gen_rows(field_names, records)
+        next(rowi) # heads
+        next(rowi) # types
+
+        texts = defaultdict(OrderedDict)
+        for head, hash, text in rowi:
+            texts[head][hash] = text
+
         head_hashes = list(texts[0].keys())
         head_items = [texts[head_hash].items() for head_hash in head_hashes[1:]]
         for pairs in zip(*head_items):
@@ -323,12 +925,8 @@ class CompactTable(Table):
     RO_FIELD_NAME = re.compile("\w+")
 
     @classmethod
-    def create(cls, org_table):
-        rowi = cls.gen_rows(org_table.field_names, org_table.field_types, org_table.records)
-        heads = next(rowi)
-        types = next(rowi)
-        recs = list(rowi)
-        return cls(heads, types, recs)
+    def create(cls, org_table, stream=False):
+        return cls.create_rows(cls.gen_rows, (org_table.field_names, org_table.field_types, org_table.records), stream)
 
     @classmethod
     def gen_rows(cls, fld_names, fld_types, recs):
@@ -350,21 +948,616 @@ class CompactTable(Table):
             yield vals
 
 class BinaryTable(Table):
+    """
+    records keep fixed width values(numbers) as they are, variable length values as dumped bytes
+
+    file layout(native byte order)
+        header: MAGIC VERSION COLUMNS ROWS STRIDE HEAP_OFFSET DICT_OFFSET (NAME_SIZE NAME TYPE_SIZE TYPE CODE_SIZE)*
+        record: STRIDE bytes per row, fixed width values in place, (HEAP_OFFSET, SIZE) for variable length bytes,
+                CODE_SIZE bytes dictionary code for dictionary encoded variable length bytes
+        heap: variable length bytes, written once per distinct value
+        dict: (COUNT (HEAP_OFFSET, SIZE)*)* for each dictionary encoded column
+
+    block container layout(save with block_rows)
+        header: MAGIC_BLOCKS VERSION COLUMNS ROWS STRIDE HEAP_SIZE DICT_OFFSET (NAME_SIZE NAME TYPE_SIZE TYPE CODE_SIZE)*
+        blocks: BLOCK_ROWS BLOCK_COUNT HEAP_BLOCK_SIZE HEAP_BLOCK_COUNT (OFFSET, SIZE)* of record blocks then heap blocks
+        dict: same as above
+        record block: zlib(byte planes of BLOCK_ROWS records), int:pk columns delta encoded
+        heap block: zlib(HEAP_BLOCK_SIZE heap bytes)
+    """
+    MAGIC = b'PYRT'
+    MAGIC_BLOCKS = b'PYRZ'
+    VERSION = 3
+
+    st_header = struct.Struct('=4sIIIIQQ')
+    st_size = struct.Struct('=I')
+    st_heap_ref = struct.Struct('=II')
+    st_blocks = struct.Struct('=IIII')
+    st_block_ref = struct.Struct('=QI')
+
+    code_size_to_struct_code = {1: 'B', 2: 'H'}
+
+    heap_block_size = 0x4000
+    block_cache_size = 16
+
     @classmethod
-    def create(cls, org_table):
-        rowi = cls.gen_rows(org_table.field_names, org_table.field_types, org_table.records)
-        heads = next(rowi)
-        types = next(rowi)
-        recs = list(rowi)
-        return cls(heads, types, recs)
+    def create(cls, org_table, stream=False):
+        return cls.create_rows(cls.gen_rows, (org_table.field_names, org_table.field_types, org_table.records), stream)
 
     @classmethod
     def gen_rows(cls, fld_names, fld_types, recs):
         yield [fld_name.encode('utf8') for fld_name in fld_names]
         yield [repr(fld_type).encode('utf8') for fld_type in fld_types]
-        for rec in recs:
-            yield [fld_type.dump(val) for fld_type, val in zip(fld_types, rec)]
 
+        dump_record = cls.compile(fld_types)
+
+        profiler = TableProfiler.get()
+        if profiler:
+            funcs = [(lambda val: val) if fld_type.struct_code else fld_type.dump for fld_type in fld_types]
+            fallback = lambda row_idx, rec: dump_record(rec)
+            yield from profiler.gen_column_values(cls.__name__, fld_names, funcs, recs, fallback)
+            return
+
+        yield from map(dump_record, recs)
+
+    @classmethod
+    def compile(cls, fld_types):
+        """
+        returns record dumper, fixed width values are kept to be packed by row struct on save
+        """
+        # def dump_record(rec):
+        #     v0, v1 = rec
+        #     return [v0, d1(v1)]
+        names = {f'd{idx}': fld_type.dump for idx, fld_type in enumerate(fld_types)}
+        vals = ', '.join(f'v{idx}' for idx in range(len(fld_types)))
+        dumps = ', '.join(f'v{idx}' if fld_type.struct_code else f'd{idx}(v{idx})' for idx, fld_type in enumerate(fld_types))
+        code = f"def dump_record(rec):\n    {vals}, = rec\n    return [{dumps}]\n" if fld_types else "def dump_record(rec):\n    return []\n"
+        exec(code, names)
+        return names['dump_record']
+
+    @classmethod
+    def get_layout(cls, fld_exprs, code_sizes=None):
+        """
+        returns [(offset, struct code or None for heap bytes)], stride
+        """
+        layout = []
+        offset = 0
+        for col_idx, fld_expr in enumerate(fld_exprs):
+            code = FieldType.parse(fld_expr).struct_code
+            if code_sizes and code_sizes[col_idx]:
+                code = cls.code_size_to_struct_code[code_sizes[col_idx]]
+            layout.append((offset, code))
+            offset += struct.calcsize('=' + code) if code else cls.st_heap_ref.size
+        return layout, offset
+
+    @classmethod
+    def read_header(cls, buf):
+        """
+        returns (magic, version, row_count, stride, heap_offset, dict_offset, fld_names, fld_exprs, code_sizes, header end offset)
+        """
+        magic, version, col_count, row_count, stride, heap_offset, dict_offset = cls.st_header.unpack_from(buf, 0)
+
+        def read_bytes(offset):
+            size, = cls.st_size.unpack_from(buf, offset)
+            offset += cls.st_size.size
+            return buf[offset:offset + size], offset + size
+
+        fld_names = []
+        fld_exprs = []
+        code_sizes = []
+        offset = cls.st_header.size
+        for col_idx in range(col_count):
+            fld_name, offset = read_bytes(offset)
+            fld_expr, offset = read_bytes(offset)
+            code_size, = cls.st_size.unpack_from(buf, offset)
+            offset += cls.st_size.size
+            fld_names.append(fld_name.decode('utf8'))
+            fld_exprs.append(fld_expr.decode('utf8'))
+            code_sizes.append(code_size)
+        return magic, version, row_count, stride, heap_offset, dict_offset, fld_names, fld_exprs, code_sizes, offset
+
+    @classmethod
+    def get_delta_columns(cls, fld_exprs, code_sizes):
+        """
+        [(offset, unsigned struct code)] of int:pk columns, delta encoded in record blocks
+        """
+        layout, stride = cls.get_layout(fld_exprs, code_sizes)
+        delta_cols = []
+        for fld_expr, code_size, (offset, code) in zip(fld_exprs, code_sizes, layout):
+            fld_type = FieldType.parse(fld_expr)
+            if fld_type.main_attr == 'pk' and fld_type.array_code and not code_size and code in 'bhiq':
+                delta_cols.append((offset, code.upper()))
+        return delta_cols
+
+    @classmethod
+    def encode_block(cls, data, row_count, stride, delta_cols):
+        """
+        records to byte planes(byte 0 of every row, byte 1 ...) with int:pk columns replaced by wrapping deltas
+        """
+        data = bytearray(data)
+        for offset, code in delta_cols:
+            size = struct.calcsize(code)
+            col = bytearray(row_count * size)
+            for byte_idx in range(size):
+                col[byte_idx::size] = data[offset + byte_idx::stride]
+            vals = struct.unpack(f'={row_count}{code}', col)
+            mask = (1 << (8 * size)) - 1
+            deltas = [vals[0]] + [(val - prev_val) & mask for prev_val, val in zip(vals, vals[1:])]
+            col = struct.pack(f'={row_count}{code}', *deltas)
+            for byte_idx in range(size):
+                data[offset + byte_idx::stride] = col[byte_idx::size]
+        return b''.join(data[byte_idx::stride] for byte_idx in range(stride))
+
+    @classmethod
+    def decode_block(cls, block, row_count, stride, delta_cols):
+        planes = decompress(block)
+        data = bytearray(row_count * stride)
+        for byte_idx in range(stride):
+            data[byte_idx::stride] = planes[byte_idx * row_count:(byte_idx + 1) * row_count]
+        for offset, code in delta_cols:
+            size = struct.calcsize(code)
+            col = bytearray(row_count * size)
+            for byte_idx in range(size):
+                col[byte_idx::size] = data[offset + byte_idx::stride]
+            mask = (1 << (8 * size)) - 1
+            vals = [val & mask for val in accumulate(struct.unpack(f'={row_count}{code}', col))]
+            col = struct.pack(f'={row_count}{code}', *vals)
+            for byte_idx in range(size):
+                data[offset + byte_idx::stride] = col[byte_idx::size]
+        return data
+
+    @classmethod
+    def compress(cls, src_path, dst_path, block_rows=4096, level=6):
+        """
+        BinaryTable file to block container, records and heap are zlib compressed per block
+        """
+        import mmap
+        with open(src_path, 'rb') as in_file, mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            magic, version, row_count, stride, heap_offset, dict_offset, fld_names, fld_exprs, code_sizes, header_end = cls.read_header(buf)
+            if magic != cls.MAGIC or version != cls.VERSION:
+                raise cls.Error(f"FILE_FORMAT_ERROR", row=0, col=0, memo=f"{src_path} {magic} v{version}")
+
+            data_offset = header_end + (-header_end % 8)
+            delta_cols = cls.get_delta_columns(fld_exprs, code_sizes)
+
+            blocks = []
+            for beg_row in range(0, row_count, block_rows):
+                block_row_count = min(block_rows, row_count - beg_row)
+                beg = data_offset + beg_row * stride
+                blocks.append(compress(cls.encode_block(buf[beg:beg + block_row_count * stride], block_row_count, stride, delta_cols), level))
+
+            heap_size = dict_offset - heap_offset
+            heap_blocks = [compress(buf[beg:min(beg + cls.heap_block_size, dict_offset)], level) for beg in range(heap_offset, dict_offset, cls.heap_block_size)]
+
+            dict_bytes = buf[dict_offset:]
+            col_bytes = buf[cls.st_header.size:header_end]
+
+        index_offset = cls.st_header.size + len(col_bytes) + cls.st_blocks.size
+        dict_offset = index_offset + (len(blocks) + len(heap_blocks)) * cls.st_block_ref.size
+        offset = dict_offset + len(dict_bytes)
+        block_refs = []
+        for block in blocks + heap_blocks:
+            block_refs.append(cls.st_block_ref.pack(offset, len(block)))
+            offset += len(block)
+
+        with open(dst_path, 'wb') as out_file:
+            out_file.write(cls.st_header.pack(cls.MAGIC_BLOCKS, cls.VERSION, len(fld_names), row_count, stride, heap_size, dict_offset))
+            out_file.write(col_bytes)
+            out_file.write(cls.st_blocks.pack(block_rows, len(blocks), cls.heap_block_size, len(heap_blocks)))
+            out_file.write(b''.join(block_refs))
+            out_file.write(dict_bytes)
+            for block in blocks + heap_blocks:
+                out_file.write(block)
+
+    def dump_fixed_values(self, fld_types, sizes, row_idx, vals):
+        """
+        row bytes of values the row struct couldn't pack(out of range or already dumped), dumped per cell like c_type
+        """
+        def gen_dumps():
+            for col_idx, (fld_type, size, val) in enumerate(zip(fld_types, sizes, vals)):
+                if size is None:
+                    yield val
+                    continue
+
+                if type(val) is not bytes:
+                    try:
+                        val = fld_type.dump(val)
+                    except Exception as exc:
+                        raise self.Error(f"FIELD_VALUE_DUMP_ERROR", row=row_idx, col=col_idx, memo=f"{fld_type}({val!r}) {exc!r}")
+                if len(val) != size:
+                    raise self.Error(f"FIELD_VALUE_SIZE_ERROR", row=row_idx, col=col_idx, memo=f"{len(val)} != {size}")
+                yield val
+
+        return b''.join(gen_dumps())
+
+    def save(self, file_path, dictionary=True, block_rows=0):
+        """
+        records are spooled as they are generated, heap bytes are written once per distinct value,
+        heap columns of at most 65536 distinct values are stored as uint8/uint16 dictionary codes when it's smaller,
+        block_rows > 0 writes a zlib block container(see compress)
+        """
+        import tempfile
+        import shutil
+
+        if block_rows:
+            import os
+            fd, tmp_file_path = tempfile.mkstemp(suffix='.bin')
+            os.close(fd)
+            try:
+                self.save(tmp_file_path, dictionary)
+                self.compress(tmp_file_path, file_path, block_rows)
+            finally:
+                os.remove(tmp_file_path)
+            return
+
+        fld_names = self._fld_names
+        fld_exprs = [fld_type.decode('utf8') for fld_type in self._fld_types]
+        fld_types = [FieldType.parse(fld_expr) for fld_expr in fld_exprs]
+        layout, stride = self.get_layout(fld_exprs)
+        sizes = [struct.calcsize('=' + code) if code else None for offset, code in layout]
+        heap_col_idxs = [col_idx for col_idx, size in enumerate(sizes) if size is None]
+
+        # one struct per row, heap refs are packed bytes
+        row_struct = struct.Struct('=' + ''.join(code if code else f'{self.st_heap_ref.size}s' for offset, code in layout))
+        assert(row_struct.size == stride)
+
+        # heap bytes -> packed heap ref per heap column, None once it has too many distinct values
+        max_dict_count = 1 << (8 * max(self.code_size_to_struct_code)) if dictionary else 0
+        col_refs = {col_idx: {} for col_idx, size in enumerate(sizes) if size is None}
+
+        data_offset = self.st_header.size + sum(self.st_size.size * 3 + len(fld_name) + len(fld_type) for fld_name, fld_type in zip(fld_names, self._fld_types))
+        data_offset += -data_offset % 8
+
+        with open(file_path, 'wb') as out_file, tempfile.TemporaryFile() as rec_file, tempfile.TemporaryFile() as heap_file:
+            heap_buf = bytearray()
+            pack_heap_ref = self.st_heap_ref.pack
+            pack_row = row_struct.pack_into
+            heap_size = 0
+            row_count = 0
+
+            # rows are packed into a preallocated buffer, flushed with heap bytes every rows_per_write rows
+            rows_per_write = max(1, 0x40000 // max(stride, 1))
+            row_buf = bytearray(stride * rows_per_write)
+            row_offset = 0
+            for row_idx, rec in enumerate(self._recs, ROW_IDX_BODYS):
+                vals = list(rec)
+                for col_idx in heap_col_idxs:
+                    val = vals[col_idx]
+                    refs = col_refs[col_idx]
+                    ref = refs.get(val) if refs is not None else None
+                    if ref is None:
+                        ref = pack_heap_ref(heap_size, len(val))
+                        heap_buf += val
+                        heap_size += len(val)
+                        if refs is not None:
+                            if len(refs) < max_dict_count:
+                                refs[val] = ref
+                            else:
+                                col_refs[col_idx] = None
+                    vals[col_idx] = ref
+
+                try:
+                    pack_row(row_buf, row_offset, *vals)
+                except struct.error:
+                    row_buf[row_offset:row_offset + stride] = self.dump_fixed_values(fld_types, sizes, row_idx, vals)
+                row_offset += stride
+                row_count += 1
+                if row_offset == len(row_buf):
+                    rec_file.write(row_buf)
+                    row_offset = 0
+                    heap_file.write(heap_buf)
+                    heap_buf.clear()
+            rec_file.write(memoryview(row_buf)[:row_offset])
+            heap_file.write(heap_buf)
+
+            # dictionary codes replace heap refs when the codes and dictionary are smaller than the refs
+            code_sizes = [0] * len(fld_names)
+            for col_idx, refs in col_refs.items():
+                if refs is None: continue
+                code_size = 1 if len(refs) <= 0x100 else 2
+                if self.st_size.size + len(refs) * self.st_heap_ref.size < (self.st_heap_ref.size - code_size) * row_count:
+                    code_sizes[col_idx] = code_size
+
+            out_file.seek(data_offset)
+            rec_file.seek(0)
+            if any(code_sizes):
+                code_layout, stride = self.get_layout(fld_exprs, code_sizes)
+                rec_struct = struct.Struct('=' + ''.join(f'{size or self.st_heap_ref.size}s' for size in sizes))
+                code_struct = struct.Struct('=' + ''.join(code if code_size else f'{size or self.st_heap_ref.size}s' for size, code_size, (offset, code) in zip(sizes, code_sizes, code_layout)))
+                ref_to_codes = [{ref: code for code, ref in enumerate(col_refs[col_idx].values())} if code_size else None for col_idx, code_size in enumerate(code_sizes)]
+                dict_col_idxs = [col_idx for col_idx, code_size in enumerate(code_sizes) if code_size]
+                pack_code = code_struct.pack
+                while True:
+                    data = rec_file.read(rec_struct.size * 4096)
+                    if not data: break
+                    rows = []
+                    for vals in rec_struct.iter_unpack(data):
+                        vals = list(vals)
+                        for col_idx in dict_col_idxs:
+                            vals[col_idx] = ref_to_codes[col_idx][vals[col_idx]]
+                        rows.append(pack_code(*vals))
+                    out_file.write(b''.join(rows))
+            else:
+                shutil.copyfileobj(rec_file, out_file)
+
+            heap_offset = data_offset + row_count * stride
+            heap_file.seek(0)
+            shutil.copyfileobj(heap_file, out_file)
+
+            dict_offset = heap_offset + heap_size
+            for col_idx, code_size in enumerate(code_sizes):
+                if code_size:
+                    refs = col_refs[col_idx]
+                    out_file.write(self.st_size.pack(len(refs)) + b''.join(refs.values()))
+
+            out_file.seek(0)
+            out_file.write(self.st_header.pack(self.MAGIC, self.VERSION, len(fld_names), row_count, stride, heap_offset, dict_offset))
+            for fld_name, fld_type, code_size in zip(fld_names, self._fld_types, code_sizes):
+                out_file.write(self.st_size.pack(len(fld_name)) + fld_name + self.st_size.pack(len(fld_type)) + fld_type + self.st_size.pack(code_size))
+
+class MappedRecords:
+    def __init__(self, buf, data_offset, heap_offset, row_count, layout, stride, dict_refs=None):
+        self._buf = buf
+        self._data_offset = data_offset
+        self._heap_offset = heap_offset
+        self._row_count = row_count
+        self._layout = layout
+        self._stride = stride
+        self._dict_refs = dict_refs or {}
+        self._dicts = {}
+        self._row_struct = struct.Struct('=' + ''.join(code if code else 'II' for offset, code in layout))
+        self._heap_col_idxs = [col_idx for col_idx, (offset, code) in enumerate(layout) if not code]
+
+    @property
+    def layout(self): return self._layout
+
+    @property
+    def stride(self): return self._stride
+
+    @property
+    def data_offset(self): return self._data_offset
+
+    @property
+    def block_rows(self): return 0
+
+    def __len__(self):
+        return self._row_count
+
+    def __getitem__(self, row_idx):
+        if row_idx < 0:
+            row_idx += self._row_count
+        if not 0 <= row_idx < self._row_count:
+            raise IndexError(row_idx)
+
+        vals = self._unpack_row(row_idx)
+        if not self._heap_col_idxs and not self._dict_refs:
+            return list(vals)
+
+        read_heap = self._read_heap
+        dict_refs = self._dict_refs
+        rec = []
+        vali = iter(vals)
+        for col_idx, (offset, code) in enumerate(self._layout):
+            if not code:
+                beg = next(vali)
+                rec.append(read_heap(beg, next(vali)))
+            elif col_idx in dict_refs:
+                rec.append(self.get_dictionary(col_idx)[next(vali)])
+            else:
+                rec.append(next(vali))
+        return rec
+
+    def __iter__(self):
+        for row_idx in range(self._row_count):
+            yield self[row_idx]
+
+    def get_dictionary(self, col_idx):
+        """
+        heap bytes by code of dictionary encoded column read once, None for other columns
+        """
+        values = self._dicts.get(col_idx)
+        if values is None and col_idx in self._dict_refs:
+            offset, count = self._dict_refs[col_idx]
+            refs = BinaryTable.st_heap_ref.iter_unpack(self._buf[offset:offset + count * BinaryTable.st_heap_ref.size])
+            values = [self._read_heap(beg, size) for beg, size in refs]
+            self._dicts[col_idx] = values
+        return values
+
+    def get_codes(self, col_idx):
+        """
+        raw fixed width values of a column, dictionary codes for dictionary encoded columns
+        """
+        offset, code = self._layout[col_idx]
+        assert(code)
+        return [val for val, in self._unpack_column(offset, code)]
+
+    def get_column(self, col_idx):
+        offset, code = self._layout[col_idx]
+        if not code:
+            read_heap = self._read_heap
+            return [read_heap(beg, size) for beg, size in self._unpack_column(offset, 'II')]
+
+        values = self.get_dictionary(col_idx)
+        if values is not None:
+            return list(map(values.__getitem__, self.get_codes(col_idx)))
+        return self.get_codes(col_idx)
+
+    def _unpack_row(self, row_idx):
+        return self._row_struct.unpack_from(self._buf, self._data_offset + row_idx * self._stride)
+
+    def _read_heap(self, beg, size):
+        beg += self._heap_offset
+        return self._buf[beg:beg + size]
+
+    def _gen_data(self):
+        """
+        yields record bytes in whole rows
+        """
+        data = memoryview(self._buf)[self._data_offset:self._data_offset + self._row_count * self._stride]
+        try:
+            yield data
+        finally:
+            data.release()
+
+    def _unpack_column(self, offset, code):
+        if self._row_count == 0:
+            return []
+
+        fmt = '=' + ('x' * offset if offset else '') + code
+        fmt += 'x' * (self._stride - struct.calcsize(fmt))
+        vals = []
+        for data in self._gen_data():
+            vals.extend(struct.iter_unpack(fmt, data))
+        return vals
+
+class BlockDictionary:
+    """
+    dictionary values of a block container column, each code is read from heap blocks on first use
+    """
+    def __init__(self, read_heap, refs):
+        self._read_heap = read_heap
+        self._refs = refs
+        self._values = [None] * len(refs)
+
+    def __len__(self):
+        return len(self._refs)
+
+    def __getitem__(self, code):
+        val = self._values[code]
+        if val is None:
+            val = self._values[code] = self._read_heap(*self._refs[code])
+        return val
+
+    def index(self, val):
+        # heap order reads each heap block once
+        for code in sorted(range(len(self._refs)), key=self._refs.__getitem__):
+            if self[code] == val:
+                return code
+        raise ValueError(val)
+
+class BlockRecords(MappedRecords):
+    """
+    records of BinaryTable block container, a row read decompresses only its block(cached per block)
+    """
+    def __init__(self, buf, row_count, layout, stride, dict_refs, block_rows, block_refs, delta_cols, heap_block_size, heap_block_refs):
+        super(BlockRecords, self).__init__(buf, 0, 0, row_count, layout, stride, dict_refs)
+        self._block_rows = block_rows
+        self._block_refs = block_refs
+        self._delta_cols = delta_cols
+        self._heap_block_size = heap_block_size
+        self._heap_block_refs = heap_block_refs
+        self._read_block = lru_cache(maxsize=BinaryTable.block_cache_size)(self._read_block)
+        self._read_heap_block = lru_cache(maxsize=BinaryTable.block_cache_size)(self._read_heap_block)
+
+    @property
+    def block_rows(self): return self._block_rows
+
+    def get_dictionary(self, col_idx):
+        values = self._dicts.get(col_idx)
+        if values is None and col_idx in self._dict_refs:
+            offset, count = self._dict_refs[col_idx]
+            refs = list(BinaryTable.st_heap_ref.iter_unpack(self._buf[offset:offset + count * BinaryTable.st_heap_ref.size]))
+            values = self._dicts[col_idx] = BlockDictionary(self._read_heap, refs)
+        return values
+
+    def _read_block(self, block_idx):
+        offset, size = self._block_refs[block_idx]
+        row_count = min(self._block_rows, self._row_count - block_idx * self._block_rows)
+        return BinaryTable.decode_block(self._buf[offset:offset + size], row_count, self._stride, self._delta_cols)
+
+    def _read_heap_block(self, block_idx):
+        offset, size = self._heap_block_refs[block_idx]
+        return decompress(self._buf[offset:offset + size])
+
+    def _unpack_row(self, row_idx):
+        block_idx, block_row_idx = divmod(row_idx, self._block_rows)
+        return self._row_struct.unpack_from(self._read_block(block_idx), block_row_idx * self._stride)
+
+    def _read_heap(self, beg, size):
+        chunks = []
+        while size > 0:
+            block_idx, block_beg = divmod(beg, self._heap_block_size)
+            chunk = self._read_heap_block(block_idx)[block_beg:block_beg + size]
+            chunks.append(chunk)
+            beg += len(chunk)
+            size -= len(chunk)
+        return b''.join(chunks)
+
+    def _gen_data(self):
+        for block_idx in range(len(self._block_refs)):
+            yield self._read_block(block_idx)
+
+class MappedTable(Table):
+    """
+    read only BinaryTable file or block container, rows and columns are decoded on demand from mmap
+    """
+    @classmethod
+    def open(cls, file_path):
+        import mmap
+        with open(file_path, 'rb') as in_file:
+            buf = mmap.mmap(in_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, row_count, stride, heap_offset, dict_offset, fld_names, fld_exprs, code_sizes, offset = BinaryTable.read_header(buf)
+        if magic not in (BinaryTable.MAGIC, BinaryTable.MAGIC_BLOCKS) or version != BinaryTable.VERSION:
+            buf.close()
+            raise cls.Error(f"FILE_FORMAT_ERROR", row=0, col=0, memo=f"{file_path} {magic} v{version}")
+
+        layout, layout_stride = BinaryTable.get_layout(fld_exprs, code_sizes)
+        assert(layout_stride == stride)
+
+        # (first heap ref offset, count) of each dictionary
+        dict_refs = {}
+        dict_ref_offset = dict_offset
+        for col_idx, code_size in enumerate(code_sizes):
+            if code_size:
+                count, = BinaryTable.st_size.unpack_from(buf, dict_ref_offset)
+                dict_ref_offset += BinaryTable.st_size.size
+                dict_refs[col_idx] = (dict_ref_offset, count)
+                dict_ref_offset += count * BinaryTable.st_heap_ref.size
+
+        if magic == BinaryTable.MAGIC_BLOCKS:
+            block_rows, block_count, heap_block_size, heap_block_count = BinaryTable.st_blocks.unpack_from(buf, offset)
+            offset += BinaryTable.st_blocks.size
+            block_refs = list(BinaryTable.st_block_ref.iter_unpack(buf[offset:offset + (block_count + heap_block_count) * BinaryTable.st_block_ref.size]))
+            delta_cols = BinaryTable.get_delta_columns(fld_exprs, code_sizes)
+            recs = BlockRecords(buf, row_count, layout, stride, dict_refs,
+                block_rows, block_refs[:block_count], delta_cols, heap_block_size, block_refs[block_count:])
+        else:
+            data_offset = offset + (-offset % 8)
+            recs = MappedRecords(buf, data_offset, heap_offset, row_count, layout, stride, dict_refs)
+
+        fld_types = [FieldType.parse(fld_expr) for fld_expr in fld_exprs]
+        table = cls(fld_names, fld_types, recs)
+        table._buf = buf
+        return table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._buf.close()
+
+    def get_column(self, fld_name):
+        return self._recs.get_column(self._fld_names.index(fld_name))
+
+    def get_row_indexes(self, fld_name, val):
+        """
+        row indexes whose stored value equals val(dumped bytes for heap columns),
+        dictionary encoded columns compare codes without reading the heap
+        """
+        col_idx = self._fld_names.index(fld_name)
+        values = self._recs.get_dictionary(col_idx)
+        if values is None:
+            return [row_idx for row_idx, col_val in enumerate(self._recs.get_column(col_idx)) if col_val == val]
+
+        try:
+            code = values.index(val)
+        except ValueError:
+            return []
+        return [row_idx for row_idx, col_code in enumerate(self._recs.get_codes(col_idx)) if col_code == code]
 
 if __name__ == '__main__':
     import logging
@@ -372,6 +1565,8 @@ if __name__ == '__main__':
 
     import yaml
     FieldType.add("yaml", str, bytes, convert=lambda t, m, s: yaml.safe_load(t))
+    class t_upper(str): pass
+    FieldType.add("upper", t_upper, bytes, convert=lambda text, main_attr, sub_attr: text.upper())
 
     int_type = FieldType.parse("int")
     int_bin_type = FieldType.parse("int:bin")
@@ -407,6 +1602,7 @@ if __name__ == '__main__':
     print(repr(span_type.convert("01:20:30")))
     print(repr(json_type.convert("[1, 2, 3]")))
     print(repr(yaml_type.convert("{a: 1, b: 2}")))
+    assert(FieldType.parse("upper").convert("abc") == "ABC")
 
     print(int_type.dump(10).hex())
     print(int16_pk_type.dump(30000).hex())
@@ -0,0 +1,96 @@
+"""
+optional NumPy column conversion of int*/uint*/real* fields with c_type range checks,
+chunks NumPy can't parse are converted per cell by the field type
+"""
+from array import array
+
+from .table import Table, ROW_IDX_BODYS
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CHUNK_SIZE = 4096
+
+# decimal texts are parsed by numpy itself, bin/oct/hex by the field converter straight into numpy buffers
+DECIMAL_MAIN_ATTRS = (None, 'pk', 'fk')
+RADIX_MAIN_ATTRS = ('bin', 'oct', 'hex')
+
+def is_available():
+    return numpy is not None
+
+def get_dtype(fld_type):
+    """
+    numpy dtype of vectorizable field types, None for others
+    """
+    if numpy is None: return None
+    if fld_type.main_attr not in DECIMAL_MAIN_ATTRS + RADIX_MAIN_ATTRS: return None
+    code = fld_type.array_code and fld_type.struct_code
+    if not code: return None
+    return numpy.dtype('=' + code)
+
+def get_work_dtype(dtype):
+    if dtype.kind == 'f': return numpy.dtype(numpy.float64)
+    if dtype.kind == 'u' and dtype.itemsize == 8: return numpy.dtype(numpy.uint64)
+    return numpy.dtype(numpy.int64)
+
+def parse_chunk(fld_type, vals, work_dtype):
+    """
+    returns work dtype array, None when any value failed
+    """
+    try:
+        if fld_type.main_attr in RADIX_MAIN_ATTRS:
+            return numpy.fromiter(map(fld_type.compiled_convert, vals), dtype=work_dtype, count=len(vals))
+        return numpy.array(vals, dtype=work_dtype)
+    except (ValueError, OverflowError, TypeError):
+        return None
+
+def convert_column(fld_type, col_idx, vals):
+    """
+    returns int64/uint64/float64 numpy array in the field c_type range, raises Table.Error at the first failed or overflowed row
+    """
+    dtype = get_dtype(fld_type)
+    assert(dtype is not None)
+
+    work_dtype = get_work_dtype(dtype)
+    info = numpy.finfo(dtype) if dtype.kind == 'f' else numpy.iinfo(dtype)
+    lo, hi = info.min, info.max
+
+    col = numpy.empty(len(vals), dtype=work_dtype)
+    for beg in range(0, len(vals), CHUNK_SIZE):
+        chunk_vals = vals[beg:beg + CHUNK_SIZE]
+        chunk = parse_chunk(fld_type, chunk_vals, work_dtype)
+        if chunk is None:
+            chunk = numpy.empty(len(chunk_vals), dtype=work_dtype)
+            for idx, fld_val in enumerate(chunk_vals):
+                row_idx = ROW_IDX_BODYS + beg + idx
+                try:
+                    val = fld_type.convert(fld_val)
+                except Exception as exc:
+                    raise Table.Error(f"FIELD_VALUE_CONVERT_ERROR", row=row_idx, col=col_idx, memo=f"{fld_type}({fld_val!r}) {exc!r}")
+                if not lo <= val <= hi:
+                    raise Table.Error(f"FIELD_VALUE_OVERFLOW", row=row_idx, col=col_idx, memo=f"{fld_type}({val!r}) not in [{lo}, {hi}]")
+                chunk[idx] = val
+
+        if dtype.kind == 'f':
+            over_mask = numpy.isfinite(chunk) & (numpy.abs(chunk) > hi)
+        elif work_dtype == dtype:
+            over_mask = None # int64/uint64 already range checked by numpy
+        else:
+            over_mask = (chunk < lo) | (chunk > hi)
+        if over_mask is not None and over_mask.any():
+            idx = int(numpy.flatnonzero(over_mask)[0])
+            raise Table.Error(f"FIELD_VALUE_OVERFLOW", row=ROW_IDX_BODYS + beg + idx, col=col_idx,
+                memo=f"{fld_type}({chunk_vals[idx]!r}) not in [{lo}, {hi}]")
+
+        col[beg:beg + len(chunk_vals)] = chunk
+    return col
+
+def to_array(fld_type, col):
+    """
+    array.array of the field array code filled from the converted column bytes
+    """
+    vals = array(fld_type.array_code)
+    vals.frombytes(col.astype(get_dtype(fld_type), copy=False).tobytes())
+    return vals
@@ -1,5 +1,7 @@
 import logging
+import time
 import sys
+import re
 import os
 
 EXIT_CODE_OK = 0
@@ -11,6 +13,8 @@ CODE_DIR_PATH = os.path.realpath(os.path.join(CODE_PROJECT_DIR_PATH, '..'))
 WORK_DIR_PATH = os.path.realpath(os.path.join(CODE_DIR_PATH, '..'))
 
 class Uri:
+    ro_uri = re.compile(r"(\w+)://(.+)")
+
     _scheme_abs_paths = {}
 
     @classmethod
@@ -26,12 +30,78 @@ class Uri:
         scheme_abs_path = cls._scheme_abs_paths[scheme_name]
         return os.path.join(scheme_abs_path, file_name)
 
+    @classmethod
+    def resolve(cls, uri):
+        """
+        'scheme://file_name' to the file path of the scheme, plain paths as they are, '' for empty uri
+        """
+        if not uri:
+            return ''
+
+        mo = cls.ro_uri.fullmatch(uri)
+        if not mo:
+            return uri
+
+        return cls.get_file_path(mo.group(1), mo.group(2))
+
 class StructuredLogger(logging.Logger):
+    """
+    logger.info('message', key=value) logs kwargs as extra context, checking the level before building it
+
+    per call site limits:
+        _sample=0.1: logs 10% of calls
+        _rate=5: logs at most 5 calls per second
+    """
+    _call_site_windows = {}
+
     @classmethod
     def wrap(cls, func, key):
-        wrapped_func = lambda *args, **kwargs: func(*args, extra={key: kwargs})
+        level = logging.getLevelName(func.__name__.upper())
+
+        def wrapped_func(self, msg, *args, **kwargs):
+            if not self.isEnabledFor(level):
+                return
+
+            if '_sample' in kwargs or '_rate' in kwargs:
+                dropped_count = cls.pass_call_site(sys._getframe(1), kwargs.pop('_sample', None), kwargs.pop('_rate', None))
+                if dropped_count is None:
+                    return
+                if dropped_count:
+                    kwargs['dropped'] = dropped_count
+
+            self._log(level, msg, args, extra={key: kwargs}, stacklevel=2)
+
+        wrapped_func.__name__ = func.__name__
         setattr(logging.Logger, func.__name__, wrapped_func)
 
+    @classmethod
+    def pass_call_site(cls, frame, sample, rate):
+        """
+        returns None to drop the call, otherwise count of calls dropped since the last passed one
+        """
+        call_site = (frame.f_code, frame.f_lineno)
+        window = cls._call_site_windows.get(call_site)
+        if window is None:
+            window = cls._call_site_windows[call_site] = [0, 0, 0] # second, passed count, dropped count
+
+        import random
+        passed = sample is None or random.random() < sample
+        if passed and rate is not None:
+            now_sec = int(time.monotonic())
+            if window[0] != now_sec:
+                window[0] = now_sec
+                window[1] = 0
+            passed = window[1] < rate
+
+        if not passed:
+            window[2] += 1
+            return None
+
+        window[1] += 1
+        dropped_count = window[2]
+        window[2] = 0
+        return dropped_count
+
 class Application:
     class Error(Exception):
         def __init__(self, code, name, message):
@@ -41,15 +111,28 @@ class Application:
 
     logger = logging.getLogger('app')
 
-    def __init__(self, logging_level=None):
+    def __init__(self, logging_level=None, logging_queue=False):
         logging_format = "%(asctime)s\t%(levelname)s\t%(name)s\t%(message)s %(context)s"
-        if logging_level:
-            logging.basicConfig(level=logging_level, format=logging_format)
+        if not logging_level:
+            logging_level = logging.DEBUG if '--debug' in sys.argv else logging.INFO
+
+        if logging_queue:
+            # records are formatted and written in batches on a background thread
+            from .log_queue import BatchStreamHandler, DeferredQueueHandler, BatchQueueListener
+            import atexit
+            import queue
+
+            handler = BatchStreamHandler()
+            handler.setFormatter(logging.Formatter(logging_format))
+
+            log_queue = queue.SimpleQueue()
+            listener = BatchQueueListener(log_queue, handler)
+            listener.start()
+            atexit.register(listener.stop)
+
+            logging.basicConfig(level=logging_level, handlers=[DeferredQueueHandler(log_queue)])
         else:
-            if '--debug' in sys.argv:
-                logging.basicConfig(level=logging.DEBUG, format=logging_format)
-            else:
-                logging.basicConfig(level=logging.INFO, format=logging_format)
+            logging.basicConfig(level=logging_level, format=logging_format)
 
         for func in [
             logging.Logger.critical, 
@@ -0,0 +1,50 @@
+"""
+queue backed logging of Application(logging_queue=True), imported only when it's enabled
+"""
+import logging.handlers
+import logging
+import queue
+
+class BatchStreamHandler(logging.StreamHandler):
+    """
+    buffers formatted records and writes them at once, flushed by BatchQueueListener when the queue drains
+    """
+    def __init__(self, stream=None, batch_size=256):
+        super(BatchStreamHandler, self).__init__(stream)
+        self.batch_size = batch_size
+        self.lines = []
+
+    def emit(self, record):
+        try:
+            self.lines.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+
+        if len(self.lines) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.lines:
+                lines = self.lines
+                self.lines = []
+                self.stream.write(''.join(lines))
+            super(BatchStreamHandler, self).flush()
+        finally:
+            self.release()
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # formatting is left to the listener thread, context kwargs are a new dict per call
+        return record
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
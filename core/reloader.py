@@ -0,0 +1,146 @@
+import threading
+import logging
+import os
+
+from functools import partial
+
+class HotReloader:
+    """
+    polls stat(mtime, size) of watched files on a daemon thread and rebuilds the targets of changed files on it,
+    a rebuilt object is published by one reference assignment(swap) so readers holding the old one keep a consistent snapshot
+
+        reloader = HotReloader.get()
+        reloader.watch_config(GameConfig)
+        reloader.watch_project(proto_dir_path, lambda: app.project, partial(setattr, app, 'project'))
+        reloader.start()
+
+    a failed rebuild is logged and the old object stays until the files change again
+    """
+    logger = logging.getLogger('reload')
+
+    _inst = None
+
+    @classmethod
+    def get(cls):
+        if not cls._inst:
+            cls._inst = cls()
+        return cls._inst
+
+    class Target:
+        def __init__(self, name, file_paths, build, swap):
+            self.name = name
+            self.file_paths = file_paths
+            self.build = build
+            self.swap = swap
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self._targets = []
+        self._stats = {} # file_path: (mtime_ns, size) of the last build
+        self._pending_stats = {} # file_path: changed stat waiting for the next poll(files being written)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def get_stat(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def watch(self, name, file_paths, build, swap):
+        """
+        build() returns the new object and runs on the watcher thread, swap(obj) publishes it
+        """
+        file_paths = [os.path.realpath(file_path) for file_path in file_paths]
+        with self._lock:
+            for file_path in file_paths:
+                self._stats[file_path] = self.get_stat(file_path)
+            self._targets.append(self.Target(name, file_paths, build, swap))
+
+    def watch_config(self, config_cls):
+        """
+        parser sources of the config class, a built instance is swapped into its _inst
+        """
+        self.watch(config_cls.__name__, config_cls.get_source_paths(), config_cls.build, partial(setattr, config_cls, '_inst'))
+
+    def watch_project(self, proto_dir_path, get_project, set_project):
+        """
+        *.proto.csv tables of the project, a changed table is loaded and swapped in with a new project(TableProject.replace_table)
+        after its foreign keys are validated
+        """
+        from .data.project import TableProject
+
+        def build(table_name, file_path):
+            table, error = TableProject.load_table(file_path)
+            if error:
+                raise error
+            if table.get_primary_key_names():
+                table.get_primary_key_index() # raises DUPLICATE_KEY
+
+            project = get_project()
+            new_project = project.replace_table(table_name, table)
+            errors = new_project.validate(resolve=bool(project.foreign_offsets))
+            if errors:
+                raise errors[0][1]
+            return new_project
+
+        for file_name in sorted(os.listdir(proto_dir_path)):
+            if file_name.endswith(TableProject.PROTO_CSV_EXT):
+                table_name = file_name[:-len(TableProject.PROTO_CSV_EXT)]
+                file_path = os.path.join(proto_dir_path, file_name)
+                self.watch(table_name, [file_path], partial(build, table_name, file_path), set_project)
+
+    def poll(self):
+        """
+        rebuilds targets whose files changed and stayed unchanged since the previous poll, returns names of swapped targets
+        """
+        with self._lock:
+            changed_paths = set()
+            for file_path, old_stat in self._stats.items():
+                new_stat = self.get_stat(file_path)
+                if new_stat == old_stat:
+                    self._pending_stats.pop(file_path, None)
+                elif self._pending_stats.get(file_path) != new_stat:
+                    self._pending_stats[file_path] = new_stat
+                else:
+                    changed_paths.add(file_path)
+
+            targets = [target for target in self._targets if changed_paths.intersection(target.file_paths)]
+            for file_path in changed_paths:
+                self._stats[file_path] = self._pending_stats.pop(file_path)
+
+        swapped_names = []
+        for target in targets:
+            try:
+                obj = target.build()
+            except Exception as exc:
+                self.logger.error('rebuild', name=target.name, exc=repr(exc))
+                continue
+
+            target.swap(obj)
+            swapped_names.append(target.name)
+            self.logger.info('swapped', name=target.name)
+        return swapped_names
+
+    def start(self):
+        if self._thread:
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='reloader', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+
+        self._stop_event.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self.poll()
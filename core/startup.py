@@ -0,0 +1,92 @@
+import sys
+import time
+
+class StartupProfiler:
+    """
+    times module execution of every import after install(), like python -X importtime
+    """
+    _inst = None
+
+    class Finder:
+        def __init__(self, profiler):
+            self.profiler = profiler
+
+        def find_spec(self, fullname, path=None, target=None):
+            for finder in sys.meta_path:
+                if finder is self:
+                    continue
+
+                find_spec = getattr(finder, 'find_spec', None)
+                if not find_spec:
+                    continue
+
+                spec = find_spec(fullname, path, target)
+                if spec is None:
+                    continue
+
+                if spec.loader and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = StartupProfiler.Loader(spec.loader, self.profiler)
+                return spec
+            return None
+
+    class Loader:
+        def __init__(self, loader, profiler):
+            self._loader = loader
+            self._profiler = profiler
+
+        def __getattr__(self, name):
+            return getattr(self._loader, name)
+
+        def create_module(self, spec):
+            return self._loader.create_module(spec)
+
+        def exec_module(self, module):
+            self._profiler.enter(module.__name__)
+            try:
+                self._loader.exec_module(module)
+            finally:
+                self._profiler.exit()
+
+    @classmethod
+    def install(cls):
+        if not cls._inst:
+            cls._inst = cls()
+            sys.meta_path.insert(0, cls.Finder(cls._inst))
+        return cls._inst
+
+    @classmethod
+    def get(cls):
+        return cls._inst
+
+    def __init__(self):
+        self.beg_time = time.perf_counter()
+        self.records = [] # (name, depth, self_sec, total_sec)
+        self.phases = []
+        self._stack = []
+
+    def enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self):
+        name, beg_time, child_sec = self._stack.pop()
+        total_sec = time.perf_counter() - beg_time
+        if self._stack:
+            self._stack[-1][2] += total_sec
+        self.records.append((name, len(self._stack), total_sec - child_sec, total_sec))
+
+    def add_phase(self, name, sec):
+        self.phases.append((name, sec))
+
+    def report(self, out_file=None, limit=30):
+        out_file = out_file or sys.stderr
+        elapsed_sec = time.perf_counter() - self.beg_time
+        import_sec = sum(total_sec for name, depth, self_sec, total_sec in self.records if depth == 0)
+
+        print(f"startup: {elapsed_sec * 1000:.1f}ms imports: {import_sec * 1000:.1f}ms modules: {len(self.records)}", file=out_file)
+        for name, sec in self.phases:
+            print(f"  {sec * 1000:9.1f}ms  [{name}]", file=out_file)
+
+        print(f"  {'self':>9}    {'total':>9}    module", file=out_file)
+        records = sorted(self.records, key=lambda record: record[2], reverse=True)
+        for name, depth, self_sec, total_sec in records[:limit]:
+            print(f"  {self_sec * 1000:9.1f}ms {total_sec * 1000:9.1f}ms  {name}", file=out_file)
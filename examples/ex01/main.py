@@ -6,5 +6,6 @@ if __name__ == '__main__':
     from game import GameApplication
     app = GameApplication()
     app.add_config_dir_path(os.path.join(MODULE_DIR_PATH, 'configs'))
+    app.add_cache_dir_path(os.path.join(MODULE_DIR_PATH, '.cache'))
     app.run()
     
\ No newline at end of file
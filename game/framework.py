@@ -1,17 +1,39 @@
+import os
+
 from core.foundation import Application, Uri
+from core.reloader import HotReloader
+from core.data import Config
 
 from game.configs import EnvironConfig, GameConfig
 from game.plugins.plugin_PyYAML import YamlConfigFileParser
 
 class GameApplication(Application):
+    hot_reload_interval = None # seconds between polls of config sources, None to disable
+
     def add_config_dir_path(self, config_dir_path):
         Uri.add_scheme_path('cfg', config_dir_path)
 
+    def add_cache_dir_path(self, cache_dir_path):
+        Uri.add_scheme_path('cache', cache_dir_path)
+
     def _on_initializing(self):
+        cache_dir_path = Uri.get_scheme_path('cache')
+        if cache_dir_path:
+            Config.set_snapshot_dir_path(os.path.join(cache_dir_path, 'configs'))
+
         env_cfg = EnvironConfig.get()
 
         GameConfig.add(YamlConfigFileParser(Uri.get_file_path('cfg', env_cfg.game_config_file_name)))
         GameConfig.load()
 
+        if self.hot_reload_interval:
+            reloader = HotReloader.get()
+            reloader.interval = self.hot_reload_interval
+            reloader.watch_config(GameConfig)
+            reloader.start()
+
         game_cfg = GameConfig.get()
         self.logger.info("initialized", version=game_cfg.version, revision=game_cfg.revision)
+
+    def _on_exiting(self):
+        HotReloader.get().stop()
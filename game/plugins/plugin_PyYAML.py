@@ -1,5 +1,4 @@
 import logging
-import yaml
 
 from core.data import Config
 
@@ -9,6 +8,14 @@ class YamlConfigFileParser(Config.Parser):
     def __init__(self, file_path):
         self.file_path = file_path
 
+    @property
+    def source_path(self):
+        return self.file_path
+
     def deserialize(self):
+        import yaml
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader) # LibYAML if available
+
         self.logger.debug('loading', file_path=self.file_path)
-        return yaml.safe_load(open(self.file_path).read())
\ No newline at end of file
+        with open(self.file_path, 'r', encoding='utf-8') as file:
+            return yaml.load(file, Loader=loader)
\ No newline at end of file
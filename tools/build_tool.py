@@ -0,0 +1,130 @@
+import logging
+import json
+import csv
+import io
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import md5
+
+from core.data.table import Table, CompactTable, PyTable, BinaryTable
+from core.data.l10n import L10NStringPool
+
+PROTO_CSV_EXT = '.proto.csv'
+PROTO_BIN_EXT = '.proto.bin'
+
+def build_table(src_file_path, out_file_path, block_rows=0):
+    """
+    returns None or the error text, any error of one table fails only that table
+    """
+    tmp_file_path = out_file_path + '.tmp'
+    try:
+        org_table = Table.load_csv(src_file_path, stream=True)
+        bin_table = BinaryTable.create(PyTable.create(CompactTable.create(org_table, stream=True), stream=True), stream=True)
+
+        bin_table.save(tmp_file_path, block_rows=block_rows)
+        os.replace(tmp_file_path, out_file_path)
+
+        # $key[locale] texts are left out of the proto table, one string pool per locale next to it
+        if L10NStringPool.has_locales(org_table.field_names):
+            table_name = os.path.basename(out_file_path)[:-len(PROTO_BIN_EXT)]
+            L10NStringPool.build(Table.load_csv(src_file_path, stream=True), os.path.dirname(out_file_path), table_name)
+        return None
+    except Table.Error as error:
+        return str(error)
+    except Exception as exc:
+        return repr(exc)
+    finally:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+
+class ProtoBuilder:
+    logger = logging.getLogger('build')
+
+    CACHE_FILE_NAME = '.build_cache.json'
+
+    def __init__(self, src_dir_path, out_dir_path, block_rows=0):
+        self.src_dir_path = src_dir_path
+        self.out_dir_path = out_dir_path
+        self.block_rows = block_rows
+        self.cache_file_path = os.path.join(out_dir_path, self.CACHE_FILE_NAME)
+
+    def load_cache(self):
+        try:
+            with open(self.cache_file_path, 'r', encoding='utf-8') as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self, cache):
+        tmp_file_path = self.cache_file_path + '.tmp'
+        with open(tmp_file_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(cache, cache_file, indent=1, sort_keys=True)
+        os.replace(tmp_file_path, self.cache_file_path)
+
+    def gen_table_names(self):
+        for file_name in sorted(os.listdir(self.src_dir_path)):
+            if file_name.endswith(PROTO_CSV_EXT):
+                yield file_name[:-len(PROTO_CSV_EXT)]
+
+    def get_src_file_path(self, table_name):
+        return os.path.join(self.src_dir_path, table_name + PROTO_CSV_EXT)
+
+    def get_out_file_path(self, table_name):
+        return os.path.join(self.out_dir_path, table_name + PROTO_BIN_EXT)
+
+    def get_digest(self, table_name):
+        """
+        md5 of source bytes, field type expressions, binary and string pool format versions and block rows
+        """
+        with open(self.get_src_file_path(table_name), 'rb') as src_file:
+            src_bytes = src_file.read()
+
+        rowi = csv.reader(io.StringIO(src_bytes.decode('utf-8-sig'), newline=''))
+        next(rowi, None) # heads
+        fld_exprs = next(rowi, [])
+
+        digest = md5(src_bytes)
+        digest.update('\n'.join(fld_exprs).encode('utf8'))
+        digest.update(f"{BinaryTable.MAGIC}:{BinaryTable.VERSION}:{self.block_rows}:{L10NStringPool.VERSION}".encode('utf8'))
+        return digest.hexdigest()
+
+    def build(self, force=False, max_workers=None):
+        """
+        returns {table name: error} of failed tables, unchanged tables are skipped
+        """
+        os.makedirs(self.out_dir_path, exist_ok=True)
+
+        cache = {} if force else self.load_cache()
+        digests = {table_name: self.get_digest(table_name) for table_name in self.gen_table_names()}
+        table_names = [
+            table_name for table_name, digest in digests.items()
+                if cache.get(table_name) != digest or not os.path.isfile(self.get_out_file_path(table_name))]
+
+        self.logger.info('build', total=len(digests), dirty=len(table_names))
+
+        errors = {}
+        try:
+            if table_names:
+                with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                    futures = [
+                        executor.submit(build_table, self.get_src_file_path(table_name), self.get_out_file_path(table_name), self.block_rows)
+                            for table_name in table_names]
+
+                    for table_name, future in zip(table_names, futures):
+                        try:
+                            error = future.result()
+                        except Exception as exc: # worker died(BrokenProcessPool) or result not picklable
+                            error = repr(exc)
+
+                        if error:
+                            self.logger.error('build', table=table_name, error=error)
+                            errors[table_name] = error
+                            cache.pop(table_name, None)
+                        else:
+                            self.logger.debug('build', table=table_name)
+                            cache[table_name] = digests[table_name]
+        finally:
+            # tables built so far are skipped next time even when the build is interrupted
+            self.save_cache({table_name: digest for table_name, digest in cache.items() if table_name in digests})
+        return errors
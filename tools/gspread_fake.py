@@ -0,0 +1,50 @@
+import csv
+import os
+
+from datetime import datetime, timezone
+
+class FakeWorksheet:
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.title = os.path.splitext(os.path.basename(file_path))[0]
+
+    def get_all_values(self):
+        with open(self.file_path, 'r', encoding='utf-8-sig', newline='') as csv_file:
+            return list(csv.reader(csv_file))
+
+class FakeSpreadsheet:
+    def __init__(self, dir_path):
+        self.dir_path = dir_path
+        self.id = os.path.realpath(dir_path)
+        self.title = os.path.basename(dir_path)
+
+    @property
+    def lastUpdateTime(self):
+        mtime = max([os.path.getmtime(self.dir_path)] + [os.path.getmtime(sheet.file_path) for sheet in self.worksheets()])
+        return datetime.fromtimestamp(mtime, timezone.utc).isoformat()
+
+    def worksheets(self):
+        file_names = sorted(file_name for file_name in os.listdir(self.dir_path) if file_name.endswith('.csv'))
+        return [FakeWorksheet(os.path.join(self.dir_path, file_name)) for file_name in file_names]
+
+    def worksheet(self, title):
+        for sheet in self.worksheets():
+            if sheet.title == title:
+                return sheet
+        raise KeyError(title)
+
+    def get_worksheet(self, index):
+        return self.worksheets()[index]
+
+class FakeClient:
+    """
+    gspread client over local files, a book is a directory and a sheet is a csv file in it
+    """
+    def __init__(self, root_dir_path):
+        self.root_dir_path = root_dir_path
+
+    def open(self, title):
+        dir_path = os.path.join(self.root_dir_path, title)
+        if not os.path.isdir(dir_path):
+            raise KeyError(title)
+        return FakeSpreadsheet(dir_path)
@@ -1,12 +1,18 @@
 import logging
-import gspread
+import json
 import os
 
+from concurrent.futures import ThreadPoolExecutor
+
 class Workbook:
     logger = logging.getLogger('gspread')
 
-    def __init__(self) -> None:
-        self.client = gspread.service_account()
+    def __init__(self, client=None) -> None:
+        if client is None:
+            import gspread
+            client = gspread.service_account()
+
+        self.client = client
         self.work = None
 
     def open(self, book_name):
@@ -25,13 +31,137 @@ class Workbook:
             current_working_dir_path = os.getcwd()
             return os.path.join(current_working_dir_path, f'{self.book.title}.{ext}')
 
+    def get_revision(self):
+        # drive modified time of the book, sheets api has no per sheet revision
+        return getattr(self.book, 'lastUpdateTime', None)
+
+    def get_sheets(self, sheet_names=None):
+        return [self.book.worksheet(sheet_name) for sheet_name in sheet_names] if sheet_names else self.book.worksheets()
+
     def export_sheet(self, out_file_path, sheet_name=''):
         self.logger.debug('export', sheet=sheet_name, out=out_file_path)
 
         sheet = self.book.worksheet(sheet_name) if sheet_name else self.book.get_worksheet(0)
         rows = sheet.get_all_values()
+        write_csv(out_file_path, rows)
+
+def write_csv(out_file_path, rows):
+    with open(out_file_path, 'w', encoding='utf-8-sig', newline='') as out_file:
+        import csv
+        csv_writer = csv.writer(out_file)
+        csv_writer.writerows(rows)
+
+def write_bin(out_file_path, rows):
+    from core.data.table import Table, CompactTable, PyTable, BinaryTable
+
+    table = BinaryTable.create(PyTable.create(CompactTable.create(Table.create(rows, stream=True), stream=True), stream=True), stream=True)
+    tmp_file_path = out_file_path + '.tmp'
+    try:
+        table.save(tmp_file_path)
+        os.replace(tmp_file_path, out_file_path)
+    finally:
+        if os.path.exists(tmp_file_path):
+            os.remove(tmp_file_path)
+
+class BatchExporter:
+    """
+    exports every sheet of books concurrently, books whose revision is unchanged since the last export are skipped
+    """
+    logger = logging.getLogger('gspread')
+
+    CACHE_FILE_NAME = '.gspread_cache.json'
+
+    format_to_write = {
+        'csv': write_csv,
+        'bin': write_bin,
+    }
+
+    def __init__(self, out_dir_path, client=None, fmt='bin'):
+        self.out_dir_path = out_dir_path
+        self.client = client
+        self.write = self.format_to_write[fmt]
+        self.ext = fmt
+        self.cache_file_path = os.path.join(out_dir_path, self.CACHE_FILE_NAME)
+
+    def load_cache(self):
+        try:
+            with open(self.cache_file_path, 'r', encoding='utf-8') as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_cache(self, cache):
+        tmp_file_path = self.cache_file_path + '.tmp'
+        with open(tmp_file_path, 'w', encoding='utf-8') as cache_file:
+            json.dump(cache, cache_file, indent=1, sort_keys=True)
+        os.replace(tmp_file_path, self.cache_file_path)
+
+    def open_book(self, book_name, sheet_names=None):
+        """
+        returns (book, revision, sheets, error), error of a missing book or sheet fails only the book
+        """
+        try:
+            book = Workbook(self.client)
+            book.open(book_name)
+            return book, book.get_revision(), book.get_sheets(sheet_names), None
+        except Exception as exc:
+            self.logger.error('open', book=book_name, error=repr(exc))
+            return None, None, [], repr(exc)
+
+    def export(self, book_names, sheet_names=None, force=False, max_workers=None):
+        """
+        returns {book name: {sheet title: error}} of failed sheets
+        """
+        os.makedirs(self.out_dir_path, exist_ok=True)
+        if self.client is None:
+            import gspread
+            self.client = gspread.service_account()
+
+        cache = {} if force else self.load_cache()
+        cache_keys = {book_name: f"{book_name}:{self.ext}:{','.join(sheet_names) if sheet_names else '*'}" for book_name in book_names}
+        errors = {} # book level errors are kept as sheet '*'
+        revisions = {}
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                jobs = []
+                for book_name, (book, revision, sheets, error) in zip(book_names, executor.map(self.open_book, book_names, [sheet_names] * len(book_names))):
+                    if error:
+                        errors[book_name] = {'*': error}
+                        continue
+
+                    revisions[book_name] = revision
+                    if revision is not None and cache.get(cache_keys[book_name]) == revision:
+                        self.logger.debug('skip', book=book_name, revision=revision)
+                        continue
+
+                    for sheet in sheets:
+                        out_file_path = os.path.join(self.out_dir_path, f"{book.book.title}.{sheet.title}.{self.ext}")
+                        jobs.append((book_name, sheet, out_file_path))
+
+                results = executor.map(lambda job: self.export_sheet(*job), jobs)
+                for (book_name, sheet, out_file_path), error in zip(jobs, results):
+                    if error:
+                        errors.setdefault(book_name, {})[sheet.title] = error
+        finally:
+            for book_name in book_names:
+                revision = revisions.get(book_name)
+                if book_name in errors or revision is None:
+                    cache.pop(cache_keys[book_name], None)
+                else:
+                    cache[cache_keys[book_name]] = revision
+            self.save_cache(cache)
+        return errors
+
+    def export_sheet(self, book_name, sheet, out_file_path):
+        from core.data.table import Table
 
-        with open(out_file_path, 'w', encoding='utf-8-sig', newline='') as out_file:
-            import csv
-            csv_writer = csv.writer(out_file)
-            csv_writer.writerows(rows)
+        self.logger.debug('export', book=book_name, sheet=sheet.title, out=out_file_path)
+        try:
+            self.write(out_file_path, sheet.get_all_values())
+            return None
+        except Table.Error as error:
+            self.logger.error('export', book=book_name, sheet=sheet.title, error=str(error))
+            return str(error)
+        except Exception as exc:
+            self.logger.error('export', book=book_name, sheet=sheet.title, error=repr(exc))
+            return repr(exc)